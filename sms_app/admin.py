@@ -1,12 +1,65 @@
-# sms_app/admin.py
-from django.contrib import admin
+import csv
+import io
+
+from django.contrib import admin, messages
+from django.shortcuts import redirect, render
+from django.urls import path
 from .models import Student, Course, Enrollment, Grade, Attendance
+from .forms import StudentImportForm
+from .importers import import_students
 
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = ('student_id', 'first_name', 'last_name', 'email', 'enrollment_date')
     search_fields = ('student_id', 'first_name', 'last_name', 'email')
     list_filter = ('enrollment_date',)
+    change_list_template = 'admin/sms_app/student/change_list.html'
+
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_csv), name='sms_app_student_import'),
+        ]
+        return urls + super().get_urls()
+
+    def import_csv(self, request):
+        if not self.has_add_permission(request):
+            return redirect('admin:sms_app_student_changelist')
+
+        if request.method == 'POST':
+            form = StudentImportForm(request.POST, request.FILES)
+            if form.is_valid():
+                # Large uploads are spooled to disk, so this reads them in chunks
+                stream = io.TextIOWrapper(form.cleaned_data['csv_file'].file, encoding='utf-8-sig', newline='')
+                try:
+                    result = import_students(stream)
+                except (UnicodeDecodeError, csv.Error) as e:
+                    # Batches before the unreadable line have already been written
+                    result = None
+                    form.add_error('csv_file', f'The file is not a readable UTF-8 CSV file: {e}')
+            if form.is_valid() and result is not None:
+                self.message_user(
+                    request,
+                    f'{result.rows} rows read: {result.created} created, {result.updated} updated, '
+                    f'{len(result.errors)} error(s) in {result.elapsed:.2f}s',
+                    messages.WARNING if result.errors else messages.SUCCESS,
+                )
+                if not result.errors:
+                    return redirect('admin:sms_app_student_changelist')
+                return render(request, 'admin/sms_app/student/import_csv.html', {
+                    **self.admin_site.each_context(request),
+                    'opts': self.model._meta,
+                    'form': StudentImportForm(),
+                    'errors': result.errors[:200],
+                    'error_count': len(result.errors),
+                })
+        else:
+            form = StudentImportForm()
+
+        return render(request, 'admin/sms_app/student/import_csv.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'form': form,
+        })
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
@@ -27,4 +80,4 @@ class GradeAdmin(admin.ModelAdmin):
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
     list_display = ('enrollment', 'date', 'status')
-    list_filter = ('date', 'status')
\ No newline at end of file
+    list_filter = ('date', 'status')
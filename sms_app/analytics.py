@@ -0,0 +1,122 @@
+import statistics
+import time
+from collections import defaultdict
+
+from django.db.models import Count, Sum
+
+from .models import Course, CourseAttendanceDay, EnrollmentAttendance, Grade
+
+PASSING_GRADES = ('A', 'B', 'C', 'D')
+
+
+def _rate(part, total):
+    return round(100 * part / total, 1) if total else None
+
+
+def build_report(semester='', academic_year='', course_code=''):
+    """Grade distribution, pass rates, attendance rates and their correlation.
+
+    Counting is done by grouped aggregate queries in the database and the
+    attendance rollup tables; only per-course and per-enrollment summaries
+    are pulled back with values_list, never individual Grade or Attendance
+    objects.
+    """
+    timings = {}
+    letters = [value for value, label in Grade.GRADE_CHOICES]
+
+    grades = Grade.objects.all()
+    if semester:
+        grades = grades.filter(semester=semester)
+    if academic_year:
+        grades = grades.filter(academic_year=academic_year)
+    # Attendance comes from the rollup tables rather than raw Attendance rows
+    course_days = CourseAttendanceDay.objects.all()
+    enrollment_rollups = EnrollmentAttendance.objects.all()
+    if course_code:
+        grades = grades.filter(enrollment__course__course_code=course_code)
+        course_days = course_days.filter(course__course_code=course_code)
+        enrollment_rollups = enrollment_rollups.filter(enrollment__course__course_code=course_code)
+
+    started = time.perf_counter()
+    histogram = dict.fromkeys(letters, 0)
+    course_grades = defaultdict(lambda: dict.fromkeys(letters, 0))
+    for course_id, letter, total in grades.values_list('enrollment__course_id', 'grade').annotate(total=Count('id')).order_by():
+        histogram[letter] = histogram.get(letter, 0) + total
+        course_grades[course_id][letter] += total
+    timings['grade_distribution'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    course_attendance = {
+        course_id: (present, present + absent)
+        for course_id, present, absent in course_days.values('course_id').annotate(
+            present=Sum('present'), absent=Sum('absent')
+        ).values_list('course_id', 'present', 'absent').order_by()
+    }
+    timings['attendance_rates'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    course_ids = set(course_grades) | set(course_attendance)
+    courses = dict(Course.objects.filter(id__in=course_ids).values_list('id', 'course_code').order_by())
+    per_course = []
+    for course_id in sorted(course_ids, key=lambda pk: courses.get(pk, '')):
+        counts = course_grades.get(course_id, dict.fromkeys(letters, 0))
+        graded = sum(counts.values())
+        present, recorded = course_attendance.get(course_id, (0, 0))
+        per_course.append({
+            'course_code': courses.get(course_id, ''),
+            'grades': [counts[letter] for letter in letters],
+            'graded': graded,
+            'pass_rate': _rate(sum(counts[letter] for letter in PASSING_GRADES), graded),
+            'attendance_rate': _rate(present, recorded),
+        })
+
+    trend = []
+    term_rows = grades.values_list('academic_year', 'semester', 'grade').annotate(total=Count('id')).order_by('academic_year', 'semester')
+    terms = {}
+    for year, term_semester, letter, total in term_rows:
+        term = terms.setdefault((year, term_semester), {'graded': 0, 'passed': 0, 'points': 0})
+        term['graded'] += total
+        term['passed'] += total if letter in PASSING_GRADES else 0
+        term['points'] += total * Grade.GRADE_POINTS.get(letter, 0)
+    for (year, term_semester), term in terms.items():
+        trend.append({
+            'academic_year': year,
+            'semester': term_semester,
+            'graded': term['graded'],
+            'pass_rate': _rate(term['passed'], term['graded']),
+            'mean_points': round(term['points'] / term['graded'], 2) if term['graded'] else None,
+        })
+    timings['summaries'] = time.perf_counter() - started
+
+    # Pair each graded enrollment's points with its attendance rate
+    started = time.perf_counter()
+    enrollment_attendance = {
+        enrollment_id: present / (present + absent)
+        for enrollment_id, present, absent in enrollment_rollups.values_list('enrollment_id', 'present', 'absent')
+        if present + absent
+    }
+    points, rates = [], []
+    for enrollment_id, letter in grades.values_list('enrollment_id', 'grade').iterator(chunk_size=5000):
+        rate = enrollment_attendance.get(enrollment_id)
+        if rate is not None:
+            points.append(Grade.GRADE_POINTS.get(letter, 0))
+            rates.append(rate)
+    try:
+        correlation = round(statistics.correlation(rates, points), 3)
+    except statistics.StatisticsError:
+        # Fewer than two pairs, or no variation in one of the series
+        correlation = None
+    timings['correlation'] = time.perf_counter() - started
+
+    total_graded = sum(histogram.values())
+    return {
+        'letters': letters,
+        'histogram': [{'grade': letter, 'count': histogram[letter], 'percent': _rate(histogram[letter], total_graded) or 0} for letter in letters],
+        'total_graded': total_graded,
+        'pass_rate': _rate(sum(histogram[letter] for letter in PASSING_GRADES), total_graded),
+        'per_course': per_course,
+        'trend': trend,
+        'correlation': correlation,
+        'correlation_samples': len(points),
+        'timings': {name: round(seconds * 1000, 1) for name, seconds in timings.items()},
+    }
@@ -0,0 +1,219 @@
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass, field
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+
+from .filters import filter_attendance, filter_enrollments, filter_grades
+from .models import Attendance, Course, Enrollment, Grade, Student
+
+API_VERSION = 'v1'
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 10000
+
+
+@dataclass(frozen=True)
+class Resource:
+    model: type
+    # Public field name -> ORM lookup
+    fields: dict
+    # Include name -> {public field name: ORM lookup}
+    includes: dict = field(default_factory=dict)
+    filter: object = None
+
+
+STUDENT_FIELDS = {
+    'student_id': 'student_id', 'first_name': 'first_name', 'last_name': 'last_name',
+    'email': 'email', 'phone': 'phone', 'date_of_birth': 'date_of_birth',
+    'enrollment_date': 'enrollment_date',
+}
+COURSE_FIELDS = {
+    'course_code': 'course_code', 'course_name': 'course_name', 'description': 'description',
+    'credits': 'credits', 'instructor_id': 'instructor_id',
+}
+
+
+def _related(prefix, fields):
+    return {'id': f'{prefix}id', **{name: f'{prefix}{lookup}' for name, lookup in fields.items()}}
+
+
+RESOURCES = {
+    'students': Resource(Student, STUDENT_FIELDS),
+    'courses': Resource(
+        Course, COURSE_FIELDS,
+        includes={'instructor': _related('instructor__', {
+            'username': 'username', 'first_name': 'first_name', 'last_name': 'last_name', 'email': 'email',
+        })},
+    ),
+    'enrollments': Resource(
+        Enrollment,
+        {'student_id': 'student_id', 'course_id': 'course_id', 'enrollment_date': 'enrollment_date'},
+        includes={
+            'student': _related('student__', STUDENT_FIELDS),
+            'course': _related('course__', COURSE_FIELDS),
+        },
+        filter=filter_enrollments,
+    ),
+    'grades': Resource(
+        Grade,
+        {'enrollment_id': 'enrollment_id', 'grade': 'grade', 'semester': 'semester', 'academic_year': 'academic_year'},
+        includes={
+            'student': _related('enrollment__student__', STUDENT_FIELDS),
+            'course': _related('enrollment__course__', COURSE_FIELDS),
+        },
+        filter=filter_grades,
+    ),
+    'attendance': Resource(
+        Attendance,
+        {'enrollment_id': 'enrollment_id', 'date': 'date', 'status': 'status'},
+        includes={
+            'student': _related('enrollment__student__', STUDENT_FIELDS),
+            'course': _related('enrollment__course__', COURSE_FIELDS),
+        },
+        filter=filter_attendance,
+    ),
+}
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _token_user(request):
+    """The active user whose SMS_API_TOKENS entry matches the bearer token, if any."""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    # Compare against every entry so the timing does not reveal which one matched
+    username = None
+    for candidate, name in getattr(settings, 'SMS_API_TOKENS', {}).items():
+        if hmac.compare_digest(candidate.encode(), token.encode()):
+            username = name
+    if username is None:
+        return None
+    return User.objects.filter(username=username, is_active=True).first()
+
+
+def api_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if 'Authorization' in request.headers:
+            user = _token_user(request)
+            if user is None:
+                return JsonResponse({'error': 'Invalid token'}, status=401, headers={'WWW-Authenticate': 'Bearer'})
+            request.user = user
+        elif not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required'}, status=401, headers={'WWW-Authenticate': 'Bearer'})
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as e:
+            return JsonResponse({'error': str(e)}, status=e.status)
+    return wrapper
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _select(resource, params):
+    """Work out the columns to fetch for ?fields= and ?include=."""
+    requested = _split(params.get('fields', '')) or list(resource.fields)
+    unknown = set(requested) - set(resource.fields)
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+    includes = _split(params.get('include', ''))
+    unknown = set(includes) - set(resource.includes)
+    if unknown:
+        raise ApiError(f"Unknown include(s): {', '.join(sorted(unknown))}")
+
+    columns = {'id': 'id', **{name: resource.fields[name] for name in requested}}
+    nested = {name: resource.includes[name] for name in includes}
+    return columns, nested
+
+
+def _lookups(columns, nested):
+    lookups = list(columns.values())
+    for related in nested.values():
+        lookups += related.values()
+    return list(dict.fromkeys(lookups))
+
+
+def _serialize(row, columns, nested):
+    item = {name: row[lookup] for name, lookup in columns.items()}
+    for include, related in nested.items():
+        # A null foreign key (e.g. a course without instructor) includes null
+        item[include] = (
+            {name: row[lookup] for name, lookup in related.items()}
+            if row[related['id']] is not None else None
+        )
+    return item
+
+
+def _etag_response(request, payload):
+    body = json.dumps(payload, cls=DjangoJSONEncoder)
+    etag = '"%s"' % hashlib.md5(body.encode(), usedforsecurity=False).hexdigest()
+    if etag in _split(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
+def _get_resource(name):
+    resource = RESOURCES.get(name)
+    if resource is None:
+        raise ApiError(f'Unknown resource {name!r}', status=404)
+    return resource
+
+
+@api_view
+def collection(request, resource_name):
+    resource = _get_resource(resource_name)
+    columns, nested = _select(resource, request.GET)
+
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+        cursor = int(request.GET.get('cursor', 0))
+    except ValueError:
+        raise ApiError('limit and cursor must be integers')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ApiError(f'limit must be between 1 and {MAX_LIMIT}')
+
+    queryset = resource.model.objects.order_by('id')
+    if resource.filter:
+        queryset = resource.filter(queryset, request.GET)
+    if cursor:
+        queryset = queryset.filter(id__gt=cursor)
+
+    # values() over the joined columns: one query, no model instances
+    rows = list(queryset.values(*_lookups(columns, nested))[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return _etag_response(request, {
+        'data': [_serialize(row, columns, nested) for row in rows],
+        'meta': {
+            'version': API_VERSION,
+            'count': len(rows),
+            'next_cursor': rows[-1]['id'] if has_more else None,
+        },
+    })
+
+
+@api_view
+def detail(request, resource_name, pk):
+    resource = _get_resource(resource_name)
+    columns, nested = _select(resource, request.GET)
+    row = resource.model.objects.filter(pk=pk).values(*_lookups(columns, nested)).first()
+    if row is None:
+        raise ApiError('Not found', status=404)
+    return _etag_response(request, {'data': _serialize(row, columns, nested), 'meta': {'version': API_VERSION}})
@@ -0,0 +1,142 @@
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import URLPattern, reverse
+
+from . import urls
+from .models import Attendance, Course, Enrollment, Grade
+from .roles import TEACHERS_GROUP
+
+ROLES = ('admin', 'teacher', 'user')
+# Routes that change session state on GET
+SKIPPED_ROUTES = {'logout'}
+
+
+@dataclass
+class Measurement:
+    route: str
+    role: str
+    url: str
+    status: int
+    queries: int
+    time_ms: float
+    bytes: int
+
+    @property
+    def key(self):
+        return f'{self.route}:{self.role}'
+
+
+def benchmark_users():
+    """The admin, teacher and regular user each route is requested as."""
+    teachers_group, _ = Group.objects.get_or_create(name=TEACHERS_GROUP)
+    admin, _ = User.objects.get_or_create(username='bench_admin', defaults={'is_staff': True, 'is_superuser': True})
+    teacher, created = User.objects.get_or_create(username='bench_teacher', defaults={'is_staff': True})
+    if created:
+        teacher.groups.add(teachers_group)
+        # Give the benchmark teacher a real teaching load
+        Course.objects.filter(id__in=Course.objects.order_by('id').values('id')[:3]).update(instructor=teacher)
+    user, _ = User.objects.get_or_create(username='bench_user')
+    return {'admin': admin, 'teacher': teacher, 'user': user}
+
+
+def _route_kwargs(teacher):
+    enrollment = Enrollment.objects.select_related('student', 'course').filter(course__instructor=teacher).first()
+    student = enrollment.student
+    return {
+        'student_id': student.student_id,
+        'course_code': enrollment.course.course_code,
+        'enrollment_id': enrollment.id,
+        'grade_id': Grade.objects.filter(enrollment=enrollment).values_list('id', flat=True).first(),
+        'attendance_id': Attendance.objects.filter(enrollment=enrollment).values_list('id', flat=True).first(),
+        'instructor_id': teacher.id,
+        'resource_name': 'students',
+        'pk': student.pk,
+        'dataset': 'grades',
+    }
+
+
+def named_routes(kwargs):
+    """(name, url) for every named route in sms_app.urls."""
+    routes = []
+    for pattern in urls.urlpatterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name or pattern.name in SKIPPED_ROUTES:
+            continue
+        route_kwargs = {name: kwargs[name] for name in pattern.pattern.converters}
+        routes.append((pattern.name, reverse(pattern.name, kwargs=route_kwargs)))
+    return routes
+
+
+def _measure(client, url, warm):
+    if not warm:
+        cache.clear()
+    # Counted at execute time: the client's request_started resets connection.queries
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    with connection.execute_wrapper(count):
+        response = client.get(url)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+    return response.status_code, len(queries), (time.perf_counter() - started) * 1000, len(body)
+
+
+def run_benchmarks(repeat=3, warm=False):
+    users = benchmark_users()
+    routes = named_routes(_route_kwargs(users['teacher']))
+    results = []
+    for role in ROLES:
+        client = Client()
+        client.force_login(users[role])
+        for name, url in routes:
+            samples = [_measure(client, url, warm) for _ in range(repeat)]
+            status, queries, _, size = samples[-1]
+            results.append(Measurement(
+                route=name, role=role, url=url, status=status, queries=queries,
+                time_ms=round(statistics.median(sample[2] for sample in samples), 2), bytes=size,
+            ))
+    return results
+
+
+def load_baseline(path):
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baseline(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {result.key: asdict(result) for result in results}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + '\n')
+
+
+def find_regressions(results, baseline, time_tolerance=0.5, min_time_ms=20.0):
+    """Describe every result that is worse than its baseline entry.
+
+    Any extra query or a changed status is a regression; wall time has to
+    exceed the baseline by time_tolerance (a fraction) and by min_time_ms to
+    rule out timer noise on fast views.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.key)
+        if previous is None:
+            continue
+        if result.status != previous['status']:
+            regressions.append(f'{result.key}: status {previous["status"]} -> {result.status}')
+        if result.queries > previous['queries']:
+            regressions.append(f'{result.key}: queries {previous["queries"]} -> {result.queries}')
+        allowed = max(previous['time_ms'] * (1 + time_tolerance), previous['time_ms'] + min_time_ms)
+        if result.time_ms > allowed:
+            regressions.append(f'{result.key}: time {previous["time_ms"]:.1f}ms -> {result.time_ms:.1f}ms')
+    return regressions
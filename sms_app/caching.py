@@ -0,0 +1,82 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .metrics import record_cache
+from .roles import is_teacher
+
+PAGE_CACHE_TIMEOUT = 60 * 15
+
+
+def _stamp_key(label):
+    return f'sms_app:changed:{label}'
+
+
+def touch(*models):
+    """Record that rows of the given models changed just now."""
+    now = time.time()
+    cache.set_many({_stamp_key(model._meta.label_lower): now for model in models}, None)
+
+
+def last_changed(*models):
+    keys = [_stamp_key(model._meta.label_lower) for model in models]
+    stamps = cache.get_many(keys)
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        # Nothing recorded yet (e.g. after a cache flush): start the clock now
+        now = time.time()
+        cache.set_many(dict.fromkeys(missing, now), None)
+        stamps.update(dict.fromkeys(missing, now))
+    return max(stamps.values())
+
+
+def cached_page(*models, timeout=PAGE_CACHE_TIMEOUT):
+    """Serve a GET view with ETag/Last-Modified and a cached body.
+
+    The validators are derived from the change stamps of the models the page
+    reads, so any save or delete of those models invalidates it. Pages show
+    the username and role-dependent actions, so the body is cached per user
+    and role.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # Pending flash messages are rendered into the page, so skip the cache
+            if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            stamp = last_changed(*models)
+            # The role decides which buttons and links render, and can change without any stamp moving
+            role = f'{request.user.is_superuser:d}{is_teacher(request.user):d}'
+            digest = hashlib.md5(
+                f'{request.get_full_path()}|{request.user.pk}|{role}|{stamp}'.encode(), usedforsecurity=False
+            ).hexdigest()
+            etag = f'"{digest}"'
+
+            # Validate on the ETag only: a date cannot express a role change
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                key = f'sms_app:page:{view.__name__}:{digest}'
+                content = cache.get(key)
+                record_cache('page', content is not None)
+                if content is None:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code != 200 or response.streaming:
+                        return response
+                    cache.set(key, response.content, timeout)
+                else:
+                    response = HttpResponse(content)
+
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(int(stamp))
+            # Let browsers keep the page but revalidate it on every visit
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
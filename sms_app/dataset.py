@@ -0,0 +1,214 @@
+import datetime
+import random
+import time
+from dataclasses import dataclass
+
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+
+from . import rollups, stats, transcripts
+from .caching import touch
+from .models import Attendance, Course, Enrollment, Grade, Student
+from .risk import scan_enrollments
+from .roles import TEACHERS_GROUP
+from .search import build_course_document
+
+BATCH_SIZE = 10000
+# Students whose enrollments, grades and attendance are built and written together
+STUDENT_CHUNK = 1000
+COURSES_PER_TERM = 4
+WEEKS_PER_TERM = 15
+COURSES_PER_INSTRUCTOR = 4
+
+FIRST_NAMES = [
+    'James', 'Mary', 'Amir', 'Li', 'Sofia', 'Kwame', 'Priya', 'Lucas', 'Aiko', 'Omar', 'Elena', 'Noah',
+    'Fatima', 'Mateo', 'Chloe', 'Ivan', 'Zara', 'Diego', 'Hana', 'Samuel', 'Leila', 'Ethan', 'Nia', 'Yusuf',
+]
+LAST_NAMES = [
+    'Smith', 'Garcia', 'Chen', 'Okafor', 'Patel', 'Kim', 'Novak', 'Silva', 'Haddad', 'Jones', 'Ivanova',
+    'Nguyen', 'Mensah', 'Rossi', 'Tanaka', 'Müller', 'Kowalski', 'Ahmed', 'Brown', 'Larsen', 'Costa',
+]
+DEPARTMENTS = [
+    ('CS', 'Computer Science'), ('MATH', 'Mathematics'), ('PHYS', 'Physics'), ('CHEM', 'Chemistry'),
+    ('BIO', 'Biology'), ('HIST', 'History'), ('ENG', 'English'), ('ECON', 'Economics'),
+    ('PSY', 'Psychology'), ('ART', 'Fine Arts'),
+]
+TOPICS = ['Foundations', 'Methods', 'Theory', 'Laboratory', 'Seminar', 'Applications', 'Topics', 'Workshop']
+# Weekday offsets a course meets on
+MEETING_PATTERNS = [(0, 2, 4), (1, 3), (0, 2), (1, 3)]
+
+
+@dataclass
+class DatasetResult:
+    instructors: int = 0
+    students: int = 0
+    courses: int = 0
+    enrollments: int = 0
+    grades: int = 0
+    attendance: int = 0
+    elapsed: float = 0.0
+
+
+def _flush(model, objs):
+    # One transaction per batch keeps commits cheap without holding locks for the whole run
+    with transaction.atomic():
+        model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+    count = len(objs)
+    objs.clear()
+    return count
+
+
+def _terms(count, start_year):
+    """(semester, academic_year, first Monday of classes), oldest first."""
+    terms = []
+    for index in range(count):
+        year = start_year + index // 2
+        if index % 2 == 0:
+            start = datetime.date(year, 9, 1)
+            semester = 'Fall'
+        else:
+            start = datetime.date(year + 1, 1, 12)
+            semester = 'Spring'
+        start += datetime.timedelta(days=-start.weekday() % 7)
+        terms.append((semester, f'{year}-{year + 1}', start))
+    return terms
+
+
+def _grade(score):
+    if score > 0.6:
+        return 'A'
+    if score > -0.2:
+        return 'B'
+    if score > -1.0:
+        return 'C'
+    if score > -1.6:
+        return 'D'
+    return 'F'
+
+
+def instructor_usernames(courses):
+    """Usernames of the instructors generate_dataset creates for this many courses."""
+    return [f'instructor{i:05d}' for i in range(max(1, courses // COURSES_PER_INSTRUCTOR))]
+
+
+def generate_dataset(students, courses, terms, seed=0, weeks=WEEKS_PER_TERM,
+                     courses_per_term=COURSES_PER_TERM, start_year=2022, log=None):
+    """Bulk-generate a synthetic institution into a database without students or courses.
+
+    Each student has a latent ability that drives both their attendance and
+    their grades, and each course a difficulty, so analytics and at-risk
+    flags see realistic spreads. The same arguments and seed always produce
+    the same rows. Bulk inserts skip signals, so the rollup, GPA and at-risk
+    tables are rebuilt at the end.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    result = DatasetResult()
+    started = time.perf_counter()
+    term_list = _terms(terms, start_year)
+
+    teachers_group, _ = Group.objects.get_or_create(name=TEACHERS_GROUP)
+    usernames = instructor_usernames(courses)
+    result.instructors = _flush(User, [
+        User(username=username, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+             email=f'{username}@example.edu', is_staff=True, password='!')
+        for username in usernames
+    ])
+    instructors = list(User.objects.filter(username__in=usernames).order_by('username'))
+    teachers_group.user_set.add(*instructors)
+    log(f'{result.instructors} instructor(s)')
+
+    batch = []
+    for i in range(courses):
+        code, department = DEPARTMENTS[i % len(DEPARTMENTS)]
+        level = 100 + i // len(DEPARTMENTS)
+        course = Course(
+            course_code=f'{code}{level}', course_name=f'{department} {rng.choice(TOPICS)} {level}',
+            credits=rng.choice((2, 3, 3, 3, 4)), instructor=rng.choice(instructors),
+        )
+        course.search_document = build_course_document(course)
+        batch.append(course)
+    result.courses = _flush(Course, batch)
+    course_rows = list(Course.objects.order_by('course_code').values_list('id', flat=True))
+    difficulty = {course_id: rng.gauss(0, 0.4) for course_id in course_rows}
+    meetings = {course_id: rng.choice(MEETING_PATTERNS) for course_id in course_rows}
+    log(f'{result.courses} course(s)')
+
+    for i in range(students):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        batch.append(Student(
+            student_id=f'S{i + 1:07d}', first_name=first, last_name=last,
+            email=f'{first}.{last}.{i + 1}@example.edu'.lower(), phone=f'555{rng.randrange(10**7):07d}',
+            date_of_birth=datetime.date(start_year - 18, 1, 1) - datetime.timedelta(days=rng.randrange(2500)),
+        ))
+        if len(batch) >= BATCH_SIZE:
+            result.students += _flush(Student, batch)
+    result.students += _flush(Student, batch)
+    log(f'{result.students} student(s)')
+
+    # Class meeting dates per (term, meeting pattern)
+    schedule = {
+        (index, pattern): [
+            start + datetime.timedelta(weeks=week, days=day) for week in range(weeks) for day in pattern
+        ]
+        for index, (_, _, start) in enumerate(term_list) for pattern in set(MEETING_PATTERNS)
+    }
+    per_student = min(terms * courses_per_term, len(course_rows))
+    student_ids = Student.objects.order_by('student_id').values_list('id', flat=True)
+    chunk = []
+    for student_id in student_ids.iterator(chunk_size=STUDENT_CHUNK):
+        chunk.append(student_id)
+        if len(chunk) >= STUDENT_CHUNK:
+            _generate_coursework(chunk, rng, course_rows, per_student, courses_per_term,
+                                 term_list, difficulty, meetings, schedule, result)
+            chunk = []
+            log(f'{result.enrollments} enrollment(s), {result.attendance} attendance row(s)')
+    if chunk:
+        _generate_coursework(chunk, rng, course_rows, per_student, courses_per_term,
+                             term_list, difficulty, meetings, schedule, result)
+
+    log('Rebuilding attendance rollups, GPAs and at-risk flags')
+    rollups.rebuild_all()
+    transcripts.rebuild_all_gpas()
+    scan_enrollments()
+    stats.invalidate_dashboard_stats()
+    touch(User, Group, Student, Course, Enrollment, Grade, Attendance)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _generate_coursework(student_ids, rng, course_ids, per_student, courses_per_term,
+                         term_list, difficulty, meetings, schedule, result):
+    ability = {}
+    planned = {}
+    enrollments = []
+    for student_id in student_ids:
+        ability[student_id] = rng.gauss(0, 1)
+        for position, course_id in enumerate(rng.sample(course_ids, per_student)):
+            planned[student_id, course_id] = position // courses_per_term
+            enrollments.append(Enrollment(student_id=student_id, course_id=course_id))
+    result.enrollments += _flush(Enrollment, enrollments)
+
+    # Re-read the ids: MySQL does not return primary keys from bulk inserts
+    created = Enrollment.objects.filter(student_id__in=student_ids).order_by('id').values_list(
+        'id', 'student_id', 'course_id'
+    )
+    grades, attendance = [], []
+    for enrollment_id, student_id, course_id in created.iterator(chunk_size=BATCH_SIZE):
+        term = planned[student_id, course_id]
+        semester, academic_year, _ = term_list[term]
+        presence = min(0.99, max(0.4, 0.86 + 0.07 * ability[student_id] + rng.gauss(0, 0.04)))
+        present = 0
+        dates = schedule[term, meetings[course_id]]
+        for date in dates:
+            status = 'P' if rng.random() < presence else 'A'
+            present += status == 'P'
+            attendance.append(Attendance(enrollment_id=enrollment_id, date=date, status=status))
+        score = (0.8 * ability[student_id] - difficulty[course_id]
+                 + 3 * (present / len(dates) - 0.86) + rng.gauss(0, 0.6))
+        grades.append(Grade(enrollment_id=enrollment_id, grade=_grade(score),
+                            semester=semester, academic_year=academic_year))
+        if len(attendance) >= BATCH_SIZE:
+            result.attendance += _flush(Attendance, attendance)
+    result.grades += _flush(Grade, grades)
+    result.attendance += _flush(Attendance, attendance)
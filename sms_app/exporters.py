@@ -0,0 +1,86 @@
+import csv
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db.models import Q
+
+from .filters import filter_attendance, filter_enrollments, filter_grades
+from .models import Attendance, Enrollment, Grade
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the value straight back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def write_csv(buffer, header, rows):
+    writer = csv.writer(buffer)
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+@dataclass(frozen=True)
+class Export:
+    header: list
+    fields: list
+    queryset: Callable
+    filter: Callable
+    # Unique ordering the export is paged on
+    keyset: tuple = ('id',)
+
+    def rows(self, params=None):
+        # Page by keyset rather than iterator(): mysqlclient buffers a whole
+        # result set client-side, so each query is capped at one chunk.
+        # values_list over the joined columns skips model instantiation.
+        queryset = self.filter(self.queryset(), params or {}).order_by(*self.keyset)
+        width = len(self.keyset)
+        page = queryset
+        while True:
+            chunk = list(page.values_list(*self.keyset, *self.fields)[:EXPORT_CHUNK_SIZE])
+            for row in chunk:
+                yield row[width:]
+            if len(chunk) < EXPORT_CHUNK_SIZE:
+                return
+            page = queryset.filter(_after(self.keyset, chunk[-1][:width]))
+
+
+def _after(keyset, values):
+    """Rows sorting strictly after values on keyset, e.g. (date, id) > (d, i)."""
+    condition = Q()
+    for index, field in enumerate(keyset):
+        equal = dict(zip(keyset[:index], values[:index]))
+        condition |= Q(**equal, **{f'{field}__gt': values[index]})
+    return condition
+
+
+EXPORTS = {
+    'grades': Export(
+        header=['student_id', 'first_name', 'last_name', 'course_code', 'course_name',
+                'semester', 'academic_year', 'grade'],
+        fields=['enrollment__student__student_id', 'enrollment__student__first_name',
+                'enrollment__student__last_name', 'enrollment__course__course_code',
+                'enrollment__course__course_name', 'semester', 'academic_year', 'grade'],
+        queryset=lambda: Grade.objects.all(),
+        filter=filter_grades,
+    ),
+    'attendance': Export(
+        header=['date', 'student_id', 'first_name', 'last_name', 'course_code', 'status'],
+        fields=['date', 'enrollment__student__student_id', 'enrollment__student__first_name',
+                'enrollment__student__last_name', 'enrollment__course__course_code', 'status'],
+        queryset=lambda: Attendance.objects.all(),
+        filter=filter_attendance,
+        keyset=('date', 'id'),
+    ),
+    'enrollments': Export(
+        header=['student_id', 'first_name', 'last_name', 'course_code', 'course_name', 'enrollment_date'],
+        fields=['student__student_id', 'student__first_name', 'student__last_name',
+                'course__course_code', 'course__course_name', 'enrollment_date'],
+        queryset=lambda: Enrollment.objects.all(),
+        filter=filter_enrollments,
+    ),
+}
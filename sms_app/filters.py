@@ -0,0 +1,54 @@
+from django.utils.dateparse import parse_date
+
+
+def filter_grades(grades, params):
+    semester = params.get('semester', '')
+    academic_year = params.get('academic_year', '')
+    course_code = params.get('course', '')
+    letter = params.get('grade', '')
+
+    if semester:
+        grades = grades.filter(semester=semester)
+    if academic_year:
+        grades = grades.filter(academic_year=academic_year)
+    if course_code:
+        grades = grades.filter(enrollment__course__course_code=course_code)
+    if letter:
+        grades = grades.filter(grade=letter)
+    return grades
+
+
+def _date_param(params, name):
+    # parse_date returns None for malformed input but raises for impossible dates like 2024-02-30
+    try:
+        return parse_date(params.get(name, '') or '')
+    except ValueError:
+        return None
+
+
+def filter_attendance(attendances, params):
+    date_from = _date_param(params, 'date_from')
+    date_to = _date_param(params, 'date_to')
+    course_code = params.get('course', '')
+    status = params.get('status', '')
+
+    if date_from:
+        attendances = attendances.filter(date__gte=date_from)
+    if date_to:
+        attendances = attendances.filter(date__lte=date_to)
+    if course_code:
+        attendances = attendances.filter(enrollment__course__course_code=course_code)
+    if status:
+        attendances = attendances.filter(status=status)
+    return attendances
+
+
+def filter_enrollments(enrollments, params):
+    course_code = params.get('course', '')
+    student_id = params.get('student', '')
+
+    if course_code:
+        enrollments = enrollments.filter(course__course_code=course_code)
+    if student_id:
+        enrollments = enrollments.filter(student__student_id=student_id)
+    return enrollments
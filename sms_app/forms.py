@@ -1,8 +1,53 @@
 # sms_app/forms.py
 from django import forms
-from django.contrib.auth.models import User
+from django.contrib.auth.models import User, Group
+from django.core.exceptions import ValidationError
+from django.urls import reverse_lazy
 from .models import Student, Course, Enrollment, Grade, Attendance
 
+class AutocompleteSelect(forms.Select):
+    """Select that only renders the chosen option; the rest come from a JSON endpoint."""
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        # Only look up the selected rows instead of iterating the whole table
+        limited = [('', '---------')]
+        if hasattr(self.choices, 'queryset'):
+            pk_field = self.choices.queryset.model._meta.pk
+            selected = []
+            for v in value:
+                if v in ('', None):
+                    continue
+                # Submitted values are untrusted; anything that isn't a valid pk just isn't shown
+                try:
+                    selected.append(pk_field.to_python(v))
+                except ValidationError:
+                    pass
+            if selected:
+                limited += [self.choices.choice(obj) for obj in self.choices.queryset.filter(pk__in=selected)]
+        original, self.choices = self.choices, limited
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = original
+
+def student_select():
+    return AutocompleteSelect(reverse_lazy('student_autocomplete'), attrs={'class': 'form-select'})
+
+def course_select():
+    return AutocompleteSelect(reverse_lazy('course_autocomplete'), attrs={'class': 'form-select'})
+
+def enrollment_select():
+    return AutocompleteSelect(reverse_lazy('enrollment_autocomplete'), attrs={'class': 'form-select'})
+
 class StudentForm(forms.ModelForm):
     class Meta:
         model = Student
@@ -35,34 +80,25 @@ class CourseForm(forms.ModelForm):
         }
 
 class EnrollmentForm(forms.ModelForm):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Limit students to those currently enrolled (optional, but useful for editing)
-        if self.instance and self.instance.pk:
-            # When editing, keep the current student selected
-            pass
-
     class Meta:
         model = Enrollment
         fields = ['student', 'course']
         widgets = {
-            'student': forms.Select(attrs={'class': 'form-select'}),
-            'course': forms.Select(attrs={'class': 'form-select'}),
+            'student': student_select(),
+            'course': course_select(),
         }
 
 class GradeForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Limit enrollments to existing ones
-        if self.instance and self.instance.pk:
-            # When editing, keep the current enrollment selected
-            pass
+        # The selected enrollment's label needs its student and course
+        self.fields['enrollment'].queryset = Enrollment.objects.select_related('student', 'course')
 
     class Meta:
         model = Grade
         fields = '__all__'
         widgets = {
-            'enrollment': forms.Select(attrs={'class': 'form-select'}),
+            'enrollment': enrollment_select(),
             'grade': forms.Select(attrs={'class': 'form-select'}),
             'semester': forms.TextInput(attrs={'class': 'form-control'}),
             'academic_year': forms.TextInput(attrs={'class': 'form-control', 'placeholder': '2023-2024'}),
@@ -71,20 +107,36 @@ class GradeForm(forms.ModelForm):
 class AttendanceForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Limit enrollments to existing ones
-        if self.instance and self.instance.pk:
-            # When editing, keep the current enrollment selected
-            pass
+        # The selected enrollment's label needs its student and course
+        self.fields['enrollment'].queryset = Enrollment.objects.select_related('student', 'course')
 
     class Meta:
         model = Attendance
         fields = '__all__'
         widgets = {
-            'enrollment': forms.Select(attrs={'class': 'form-select'}),
+            'enrollment': enrollment_select(),
             'date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'status': forms.Select(attrs={'class': 'form-select'}),
         }
 
+class StudentImportForm(forms.Form):
+    csv_file = forms.FileField(label='CSV file', widget=forms.FileInput(attrs={'accept': '.csv'}))
+
+class RollCallForm(forms.Form):
+    course = forms.ModelChoiceField(
+        queryset=Course.objects.order_by('course_code'),
+        widget=course_select()
+    )
+    date = forms.DateField(widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+
+class GradebookForm(forms.Form):
+    course = forms.ModelChoiceField(
+        queryset=Course.objects.order_by('course_code'),
+        widget=course_select()
+    )
+    semester = forms.CharField(max_length=20, widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Semester'}))
+    academic_year = forms.CharField(max_length=9, widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': '2023-2024'}))
+
 class InstructorForm(forms.ModelForm):
     password = forms.CharField(widget=forms.PasswordInput(attrs={'class': 'form-control'}))
     is_teacher = forms.BooleanField(required=False, label="Assign as Teacher")
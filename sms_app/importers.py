@@ -0,0 +1,103 @@
+import csv
+import time
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import Student
+from .stats import invalidate_dashboard_stats
+from .utils import bulk_upsert
+
+STUDENT_IMPORT_FIELDS = ['student_id', 'first_name', 'last_name', 'email', 'phone', 'address', 'date_of_birth']
+STUDENT_REQUIRED_COLUMNS = {'student_id', 'first_name', 'last_name', 'email', 'date_of_birth'}
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def _clean_student_row(row):
+    # Run each value through the model field so the usual length, email and
+    # date rules apply without a full ModelForm per row
+    values = {}
+    errors = []
+    for name in STUDENT_IMPORT_FIELDS:
+        model_field = Student._meta.get_field(name)
+        raw = (row.get(name) or '').strip()
+        try:
+            values[name] = model_field.clean(raw, None)
+        except ValidationError as e:
+            errors.append(f"{name}: {' '.join(e.messages)}")
+    return values, errors
+
+
+def _write_student_batch(batch, columns, result):
+    existing = set(
+        Student.objects.filter(student_id__in=batch.keys()).values_list('student_id', flat=True)
+    )
+    with transaction.atomic():
+        bulk_upsert(
+            Student,
+            [Student(**values) for values in batch.values()],
+            unique_fields=['student_id'],
+            # Optional columns absent from the file keep their stored values
+            update_fields=[name for name in STUDENT_IMPORT_FIELDS if name != 'student_id' and name in columns],
+        )
+    result.updated += len(existing)
+    result.created += len(batch) - len(existing)
+
+
+def import_students(stream, batch_size=1000):
+    """Import students from a CSV text stream, upserting on student_id.
+
+    Rows are read and written batch_size at a time, so memory use does not
+    depend on the size of the file. Invalid rows are reported in
+    result.errors as (line number, message) and skipped. Optional columns
+    missing from the header are left unchanged on existing students.
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+    reader = csv.DictReader(stream)
+
+    columns = set(reader.fieldnames or [])
+    missing = STUDENT_REQUIRED_COLUMNS - columns
+    if missing:
+        result.errors.append((1, f"Missing column(s): {', '.join(sorted(missing))}"))
+        return result
+
+    seen = set()
+    batch = {}
+    for row in reader:
+        result.rows += 1
+        values, errors = _clean_student_row(row)
+        if errors:
+            result.errors.append((reader.line_num, '; '.join(errors)))
+            continue
+        if values['student_id'] in seen:
+            result.duplicates += 1
+            result.errors.append((reader.line_num, f"Duplicate student_id {values['student_id']} skipped"))
+            continue
+        seen.add(values['student_id'])
+        batch[values['student_id']] = values
+        if len(batch) >= batch_size:
+            _write_student_batch(batch, columns, result)
+            batch = {}
+
+    if batch:
+        _write_student_batch(batch, columns, result)
+    if result.created:
+        invalidate_dashboard_stats()
+
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sms_app.analytics import build_report
+
+
+class Command(BaseCommand):
+    help = 'Print grade distribution, pass rates, attendance rates and their correlation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', default='')
+        parser.add_argument('--academic-year', default='')
+        parser.add_argument('--course', default='', help='Course code')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        report = build_report(
+            semester=options['semester'],
+            academic_year=options['academic_year'],
+            course_code=options['course'],
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write('Grade distribution:')
+        for item in report['histogram']:
+            self.stdout.write(f"  {item['grade']}: {item['count']:>8} ({item['percent']}%)")
+        self.stdout.write(f"  Pass rate: {report['pass_rate']}% of {report['total_graded']} grade(s)")
+
+        self.stdout.write('\nBy term:')
+        for term in report['trend']:
+            self.stdout.write(
+                f"  {term['academic_year']} {term['semester']:<12} graded={term['graded']:<8} "
+                f"pass={term['pass_rate']}% mean_points={term['mean_points']}"
+            )
+
+        self.stdout.write('\nBy course:')
+        header = ' '.join(f'{letter:>6}' for letter in report['letters'])
+        self.stdout.write(f"  {'Course':<12} {header}   pass%  attend%")
+        for course in report['per_course']:
+            counts = ' '.join(f'{count:>6}' for count in course['grades'])
+            self.stdout.write(
+                f"  {course['course_code']:<12} {counts}  {course['pass_rate'] if course['pass_rate'] is not None else '-':>6}"
+                f"  {course['attendance_rate'] if course['attendance_rate'] is not None else '-':>7}"
+            )
+
+        self.stdout.write(
+            f"\nGrade/attendance correlation: {report['correlation']} "
+            f"over {report['correlation_samples']} enrollment(s)"
+        )
+        for name, ms in report['timings'].items():
+            self.stdout.write(f'  {name}: {ms} ms')
+        self.stdout.write(self.style.SUCCESS(f'Report built in {elapsed:.3f}s'))
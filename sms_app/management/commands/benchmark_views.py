@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from sms_app import benchmark
+from sms_app.dataset import generate_dataset
+from sms_app.models import Student
+
+DEFAULT_BASELINE = settings.BASE_DIR / 'benchmarks' / 'views.json'
+# Cold runs clear the cache before every request, which must never reach a
+# shared backend such as the production Redis
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sms-benchmark',
+        'OPTIONS': {'MAX_ENTRIES': 50000, 'CULL_FREQUENCY': 4},
+    }
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic institution in a throwaway test database, request every named '
+        'sms_app route as admin, teacher and regular user, and compare query counts and '
+        'timings against a stored baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--courses', type=int, default=100)
+        parser.add_argument('--terms', type=int, default=2)
+        parser.add_argument('--weeks', type=int, default=4, help='Weeks of attendance per term')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=3, help='Requests per route; the median time is kept')
+        parser.add_argument('--warm', action='store_true', help='Keep the cache between requests')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the seeded test database across runs')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--update-baseline', action='store_true')
+        parser.add_argument('--time-tolerance', type=float, default=0.5)
+        parser.add_argument('--min-time-ms', type=float, default=20.0)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES):
+                if not Student.objects.exists():
+                    self.stdout.write('Seeding synthetic institution...')
+                    generate_dataset(
+                        options['students'], options['courses'], options['terms'],
+                        seed=options['seed'], weeks=options['weeks'],
+                    )
+                results = benchmark.run_benchmarks(repeat=options['repeat'], warm=options['warm'])
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        self.stdout.write(f'{"route":<28} {"role":<8} {"status":>6} {"queries":>8} {"ms":>9} {"bytes":>10}')
+        for result in results:
+            self.stdout.write(
+                f'{result.route:<28} {result.role:<8} {result.status:>6} {result.queries:>8} '
+                f'{result.time_ms:>9.1f} {result.bytes:>10}'
+            )
+
+        if options['update_baseline']:
+            benchmark.save_baseline(options['baseline'], results)
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {options["baseline"]}'))
+            return
+
+        baseline = benchmark.load_baseline(options['baseline'])
+        if not baseline:
+            self.stdout.write(self.style.WARNING('No baseline found; run with --update-baseline to record one'))
+            return
+        regressions = benchmark.find_regressions(
+            results, baseline, options['time_tolerance'], options['min_time_ms'],
+        )
+        if regressions:
+            raise CommandError('Regressions against baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} measurement(s) within baseline'))
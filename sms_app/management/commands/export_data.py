@@ -0,0 +1,38 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sms_app.exporters import EXPORTS, write_csv
+
+
+class Command(BaseCommand):
+    help = 'Stream grades, attendance or enrollments to CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORTS))
+        parser.add_argument('-o', '--output', help='Output file (defaults to stdout)')
+        parser.add_argument(
+            '--filter', action='append', default=[], metavar='KEY=VALUE',
+            help='Same filters as the list pages, e.g. --filter semester=Fall --filter course=CS101'
+        )
+
+    def handle(self, *args, **options):
+        params = {}
+        for item in options['filter']:
+            key, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Invalid filter {item!r}, expected KEY=VALUE')
+            params[key] = value
+
+        export = EXPORTS[options['dataset']]
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        count = 0
+        try:
+            for line in write_csv(output, export.header, export.rows(params)):
+                count += 1
+        finally:
+            if options['output']:
+                output.close()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f"Exported {count - 1} {options['dataset']} row(s) to {options['output']}"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from sms_app.risk import CHUNK_SIZE, get_thresholds, scan_enrollments
+
+
+class Command(BaseCommand):
+    help = (
+        'Flag enrollments with low attendance or failing recent grades. '
+        'Intended to run on a schedule (e.g. nightly from cron); the dashboard reads the results.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-attendance-rate', type=float, help='Percent present below which to flag')
+        parser.add_argument('--min-attendance-records', type=int)
+        parser.add_argument('--recent-grades', type=int, help='Number of latest grades to consider')
+        parser.add_argument('--max-failing-grades', type=int)
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        thresholds = get_thresholds(
+            MIN_ATTENDANCE_RATE=options['min_attendance_rate'],
+            MIN_ATTENDANCE_RECORDS=options['min_attendance_records'],
+            RECENT_GRADES=options['recent_grades'],
+            MAX_FAILING_GRADES=options['max_failing_grades'],
+        )
+        result = scan_enrollments(thresholds, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned {result.enrollments} enrollment(s), flagged {result.flagged} '
+            f'in {result.elapsed:.2f}s'
+        ))
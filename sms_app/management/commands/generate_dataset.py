@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from sms_app.dataset import generate_dataset, instructor_usernames
+from sms_app.models import Course, Student
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate synthetic students, courses, enrollments, grades and attendance for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--courses', type=int, default=50)
+        parser.add_argument('--terms', type=int, default=2)
+        parser.add_argument('--courses-per-term', type=int, default=4)
+        parser.add_argument('--weeks', type=int, default=15, help='Weeks of classes per term')
+        parser.add_argument('--start-year', type=int, default=2022)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        # Checked up front: a clash found mid-run would leave earlier batches committed
+        if Student.objects.exists() or Course.objects.exists():
+            raise CommandError(
+                'The database already has students or courses; run this against an empty database (see flush)'
+            )
+        taken = User.objects.filter(username__in=instructor_usernames(options['courses'])).count()
+        if taken:
+            raise CommandError(f'{taken} generated instructor username(s) are already taken; run this against an empty database')
+        result = generate_dataset(
+            options['students'], options['courses'], options['terms'], seed=options['seed'],
+            weeks=options['weeks'], courses_per_term=options['courses_per_term'],
+            start_year=options['start_year'], log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {result.instructors} instructor(s), {result.courses} course(s), '
+            f'{result.students} student(s), {result.enrollments} enrollment(s), {result.grades} grade(s) '
+            f'and {result.attendance} attendance row(s) in {result.elapsed:.1f}s'
+        ))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sms_app.models import Student
+from sms_app.thumbnails import DECODE_ERRORS, generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Generate missing profile picture thumbnails for every student'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = failed = 0
+        pictures = (
+            Student.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+            .values_list('profile_picture', flat=True).iterator(chunk_size=2000)
+        )
+        field = Student._meta.get_field('profile_picture')
+        for name in pictures:
+            try:
+                written += len(generate_thumbnails(field.attr_class(None, field, name)))
+            except DECODE_ERRORS as exc:
+                failed += 1
+                self.stderr.write(f'{name}: {exc}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} thumbnail(s), {failed} failure(s) in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,36 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sms_app.importers import import_students
+
+
+class Command(BaseCommand):
+    help = 'Import students from a CSV file, creating or updating them by student_id'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path to a CSV file with a header row')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--encoding', default='utf-8-sig')
+        parser.add_argument('--max-errors', type=int, default=50, help='Number of row errors to print')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding=options['encoding']) as stream:
+                result = import_students(stream, batch_size=options['batch_size'])
+        except OSError as e:
+            raise CommandError(str(e))
+        except (UnicodeDecodeError, csv.Error) as e:
+            # Batches before the unreadable line have already been written
+            raise CommandError(f"Could not read {options['csv_file']} as {options['encoding']} CSV: {e}")
+
+        for line, message in result.errors[:options['max_errors']]:
+            self.stderr.write(f'Line {line}: {message}')
+        if len(result.errors) > options['max_errors']:
+            self.stderr.write(f"... and {len(result.errors) - options['max_errors']} more error(s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.rows} rows read: {result.created} created, {result.updated} updated, '
+            f'{len(result.errors)} error(s) in {result.elapsed:.2f}s '
+            f'({result.rows_per_second:.0f} rows/s)'
+        ))
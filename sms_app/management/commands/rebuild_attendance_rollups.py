@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sms_app.rollups import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-enrollment and per-course-day attendance rollups from raw attendance'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        enrollments, days = rebuild_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {enrollments} enrollment and {days} course-day rollup(s) '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sms_app.transcripts import rebuild_all_gpas
+
+
+class Command(BaseCommand):
+    help = 'Recompute the materialized per-term GPA table from all grades'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_all_gpas(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {count} term GPA row(s) in {time.perf_counter() - started:.2f}s'
+        ))
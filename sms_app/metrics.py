@@ -0,0 +1,167 @@
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 1000)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in sorted(self._values.items()):
+            yield f'{self.name}{_labels(zip(self.labelnames, key))} {value}'
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def samples(self):
+        for key, state in sorted(self._values.items()):
+            pairs = list(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, state):
+                yield f'{self.name}_bucket{_labels(pairs + [("le", bound)])} {count}'
+            yield f'{self.name}_bucket{_labels(pairs + [("le", "+Inf")])} {state[-2]}'
+            yield f'{self.name}_sum{_labels(pairs)} {state[-1]}'
+            yield f'{self.name}_count{_labels(pairs)} {state[-2]}'
+
+
+REQUESTS = Counter('sms_requests_total', 'Requests by URL name, method and status.', ('view', 'method', 'status'))
+REQUEST_LATENCY = Histogram('sms_request_duration_seconds', 'Request latency by URL name.', ('view',))
+DB_TIME = Histogram('sms_db_duration_seconds', 'Time spent in database queries per request.', ('view',))
+DB_QUERIES = Histogram(
+    'sms_db_queries_per_request', 'Database queries per request.', ('view',), buckets=QUERY_COUNT_BUCKETS,
+)
+TEMPLATE_TIME = Histogram('sms_template_render_seconds', 'Template render time per request.', ('view',))
+CACHE_LOOKUPS = Counter('sms_cache_lookups_total', 'Application cache lookups by cache and result.', ('cache', 'result'))
+
+REGISTRY = (REQUESTS, REQUEST_LATENCY, DB_TIME, DB_QUERIES, TEMPLATE_TIME, CACHE_LOOKUPS)
+
+
+def record_cache(cache_name, hit):
+    CACHE_LOOKUPS.inc(cache=cache_name, result='hit' if hit else 'miss')
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        with _lock:
+            lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+_templates_instrumented = False
+
+
+def instrument_templates():
+    """Time top-level Django template renders against the request being served."""
+    global _templates_instrumented
+    if _templates_instrumented:
+        return
+    from django.template.backends.django import Template
+
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            if request is not None and hasattr(request, '_sms_template_seconds'):
+                request._sms_template_seconds += time.perf_counter() - started
+
+    Template.render = render
+    _templates_instrumented = True
+
+
+class MetricsMiddleware:
+    """Collect per-URL-name request, database and template timings.
+
+    Enabled by settings.SMS_METRICS. Values live in process memory, so with
+    several worker processes each one reports its own series.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SMS_METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_templates()
+
+    def __call__(self, request):
+        db = {'seconds': 0.0, 'queries': 0}
+
+        def timed(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db['seconds'] += time.perf_counter() - started
+                db['queries'] += 1
+
+        request._sms_template_seconds = 0.0
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timed))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        REQUEST_LATENCY.observe(elapsed, view=view)
+        DB_TIME.observe(db['seconds'], view=view)
+        DB_QUERIES.observe(db['queries'], view=view)
+        TEMPLATE_TIME.observe(request._sms_template_seconds, view=view)
+        return response
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:31
+
+from django.db import migrations, models
+
+
+def populate_search_documents(apps, schema_editor):
+    Course = apps.get_model('sms_app', 'Course')
+    courses = list(Course.objects.select_related('instructor'))
+    for course in courses:
+        parts = [course.course_code, course.course_name, course.description]
+        if course.instructor:
+            parts += [course.instructor.first_name, course.instructor.last_name, course.instructor.username]
+        course.search_document = ' '.join(part for part in parts if part)
+    Course.objects.bulk_update(courses, ['search_document'], batch_size=1000)
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            'CREATE FULLTEXT INDEX course_search_ft ON sms_app_course (search_document)'
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('DROP INDEX course_search_ft ON sms_app_course')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms_app', '0002_student_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
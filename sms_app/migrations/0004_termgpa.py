@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_term_gpas(apps, schema_editor):
+    Grade = apps.get_model('sms_app', 'Grade')
+    TermGPA = apps.get_model('sms_app', 'TermGPA')
+    points = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}
+    totals = {}
+    grades = Grade.objects.values_list(
+        'enrollment__student_id', 'semester', 'academic_year', 'grade', 'enrollment__course__credits'
+    )
+    for student_id, semester, academic_year, letter, credits in grades.iterator():
+        term = totals.setdefault((student_id, semester, academic_year), [0, 0])
+        term[0] += credits
+        term[1] += points.get(letter, 0) * credits
+    TermGPA.objects.bulk_create(
+        [
+            TermGPA(student_id=student_id, semester=semester, academic_year=academic_year,
+                    credits=credits, quality_points=quality_points)
+            for (student_id, semester, academic_year), (credits, quality_points) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms_app', '0003_course_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermGPA',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=20)),
+                ('academic_year', models.CharField(max_length=9)),
+                ('credits', models.IntegerField(default=0)),
+                ('quality_points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_gpas', to='sms_app.student')),
+            ],
+            options={
+                'unique_together': {('student', 'semester', 'academic_year')},
+            },
+        ),
+        migrations.RunPython(populate_term_gpas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_rollups(apps, schema_editor):
+    Attendance = apps.get_model('sms_app', 'Attendance')
+    Enrollment = apps.get_model('sms_app', 'Enrollment')
+    EnrollmentAttendance = apps.get_model('sms_app', 'EnrollmentAttendance')
+    CourseAttendanceDay = apps.get_model('sms_app', 'CourseAttendanceDay')
+    counts = {'present': Count('id', filter=Q(status='P')), 'absent': Count('id', filter=Q(status='A'))}
+
+    per_enrollment = {
+        row['enrollment_id']: row
+        for row in Attendance.objects.values('enrollment_id').annotate(**counts).order_by()
+    }
+    EnrollmentAttendance.objects.bulk_create(
+        [
+            EnrollmentAttendance(
+                enrollment_id=pk,
+                present=per_enrollment.get(pk, {}).get('present', 0),
+                absent=per_enrollment.get(pk, {}).get('absent', 0),
+            )
+            for pk in Enrollment.objects.values_list('id', flat=True).iterator()
+        ],
+        batch_size=1000,
+    )
+    CourseAttendanceDay.objects.bulk_create(
+        [
+            CourseAttendanceDay(course_id=row['enrollment__course_id'], date=row['date'],
+                                present=row['present'], absent=row['absent'])
+            for row in Attendance.objects.values('enrollment__course_id', 'date').annotate(**counts).order_by().iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms_app', '0004_termgpa'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrollmentAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollup', to='sms_app.enrollment')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CourseAttendanceDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_days', to='sms_app.course')),
+            ],
+            options={
+                'unique_together': {('course', 'date')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms_app', '0005_attendance_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AtRiskFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attendance_rate', models.FloatField(blank=True, null=True)),
+                ('recent_grades', models.CharField(blank=True, max_length=20)),
+                ('reasons', models.CharField(max_length=255)),
+                ('flagged_at', models.DateTimeField()),
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='at_risk_flag', to='sms_app.enrollment')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='at_risk_flags', to='sms_app.student')),
+            ],
+        ),
+    ]
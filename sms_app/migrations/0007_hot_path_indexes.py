@@ -0,0 +1,68 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:44
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_grades(apps, schema_editor):
+    # Keep the oldest grade per enrollment and term, as the gradebook did,
+    # then recompute the term totals of the students affected
+    Grade = apps.get_model('sms_app', 'Grade')
+    TermGPA = apps.get_model('sms_app', 'TermGPA')
+    duplicates = (
+        Grade.objects.values('enrollment_id', 'semester', 'academic_year')
+        .annotate(keep=Min('id'), total=Count('id')).filter(total__gt=1).order_by()
+    )
+    points = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}
+    for row in duplicates.iterator():
+        Grade.objects.filter(
+            enrollment_id=row['enrollment_id'], semester=row['semester'], academic_year=row['academic_year'],
+        ).exclude(id=row['keep']).delete()
+        student_id = Grade.objects.filter(id=row['keep']).values_list('enrollment__student_id', flat=True).get()
+        credits = quality_points = 0
+        grades = Grade.objects.filter(
+            enrollment__student_id=student_id, semester=row['semester'], academic_year=row['academic_year'],
+        ).values_list('grade', 'enrollment__course__credits')
+        for letter, course_credits in grades:
+            credits += course_credits
+            quality_points += points.get(letter, 0) * course_credits
+        TermGPA.objects.filter(
+            student_id=student_id, semester=row['semester'], academic_year=row['academic_year'],
+        ).update(credits=credits, quality_points=quality_points)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms_app', '0006_atriskflag'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'id'], name='attendance_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['instructor', 'course_code'], name='course_instructor_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['course', 'enrollment_date'], name='enrollment_course_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['semester', 'academic_year'], name='grade_term_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_grades, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='grade',
+            constraint=models.UniqueConstraint(fields=('enrollment', 'semester', 'academic_year'), name='grade_unique_enrollment_term'),
+        ),
+    ]
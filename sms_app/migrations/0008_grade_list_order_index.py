@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms_app', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['-academic_year', 'semester', 'id'], name='grade_list_order_idx'),
+        ),
+    ]
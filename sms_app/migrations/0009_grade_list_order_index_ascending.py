@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms_app', '0008_grade_list_order_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='grade',
+            name='grade_list_order_idx',
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['academic_year', 'semester', 'id'], name='grade_list_order_idx'),
+        ),
+    ]
@@ -12,6 +12,15 @@ class Student(models.Model):
     date_of_birth = models.DateField()
     enrollment_date = models.DateField(auto_now_add=True)
     profile_picture = models.ImageField(upload_to='students/', blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Prefix search and sorting on the student list
+            models.Index(fields=['last_name', 'first_name'], name='student_name_idx'),
+            models.Index(fields=['first_name'], name='student_first_name_idx'),
+            models.Index(fields=['email'], name='student_email_idx'),
+            models.Index(fields=['enrollment_date'], name='student_enrollment_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.student_id})"
@@ -22,6 +31,14 @@ class Course(models.Model):
     description = models.TextField(blank=True)
     credits = models.IntegerField(default=3)
     instructor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, limit_choices_to={'groups__name': 'Teachers'})
+    # Code, name, description and instructor name, kept in sync for course search
+    search_document = models.TextField(blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # An instructor's courses in code order
+            models.Index(fields=['instructor', 'course_code'], name='course_instructor_code_idx'),
+        ]
     
     def __str__(self):
         return f"{self.course_code} - {self.course_name}"
@@ -33,6 +50,10 @@ class Enrollment(models.Model):
     
     class Meta:
         unique_together = ('student', 'course')
+        indexes = [
+            # A course's roster and the admin enrollment_date filter
+            models.Index(fields=['course', 'enrollment_date'], name='enrollment_course_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student} enrolled in {self.course}"
@@ -45,15 +66,49 @@ class Grade(models.Model):
         ('D', 'D'),
         ('F', 'F'),
     ]
+    GRADE_POINTS = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}
     
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE)
     grade = models.CharField(max_length=1, choices=GRADE_CHOICES)
     semester = models.CharField(max_length=20)
     academic_year = models.CharField(max_length=9)  # Format: 2023-2024
+
+    class Meta:
+        constraints = [
+            # One grade per enrollment and term, so grade writes can be upserts
+            models.UniqueConstraint(
+                fields=['enrollment', 'semester', 'academic_year'], name='grade_unique_enrollment_term'
+            ),
+        ]
+        indexes = [
+            # Term filters on the grade list, analytics and admin
+            models.Index(fields=['semester', 'academic_year'], name='grade_term_idx'),
+            # The grade list's newest-term-first order, read backward
+            models.Index(fields=['academic_year', 'semester', 'id'], name='grade_list_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.enrollment.student} - {self.enrollment.course}: {self.grade}"
 
+class TermGPA(models.Model):
+    # Materialized per-term totals, refreshed by sms_app.transcripts when grades change
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='term_gpas')
+    semester = models.CharField(max_length=20)
+    academic_year = models.CharField(max_length=9)
+    credits = models.IntegerField(default=0)
+    quality_points = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('student', 'semester', 'academic_year')
+
+    @property
+    def gpa(self):
+        return round(self.quality_points / self.credits, 2) if self.credits else None
+
+    def __str__(self):
+        return f"{self.student} - {self.semester} {self.academic_year}: {self.gpa}"
+
 class Attendance(models.Model):
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE)
     date = models.DateField()
@@ -61,6 +116,61 @@ class Attendance(models.Model):
     
     class Meta:
         unique_together = ('enrollment', 'date')
+        indexes = [
+            # Date range and status filters
+            models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+            # Keyset pagination of the attendance list, newest first
+            models.Index(fields=['date', 'id'], name='attendance_date_id_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.enrollment.student} - {self.date}: {self.status}"
\ No newline at end of file
+        return f"{self.enrollment.student} - {self.date}: {self.status}"
+
+class EnrollmentAttendance(models.Model):
+    # Running totals maintained by sms_app.rollups on every attendance change
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='attendance_rollup')
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+
+    @property
+    def total(self):
+        return self.present + self.absent
+
+    @property
+    def rate(self):
+        return round(100 * self.present / self.total, 1) if self.total else None
+
+    def __str__(self):
+        return f"{self.enrollment}: {self.present}/{self.total}"
+
+class CourseAttendanceDay(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='attendance_days')
+    date = models.DateField()
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('course', 'date')
+
+    @property
+    def total(self):
+        return self.present + self.absent
+
+    @property
+    def rate(self):
+        return round(100 * self.present / self.total, 1) if self.total else None
+
+    def __str__(self):
+        return f"{self.course} - {self.date}: {self.present}/{self.total}"
+
+class AtRiskFlag(models.Model):
+    # Written by the flag_at_risk_students job; the whole table is replaced on each run
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='at_risk_flag')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='at_risk_flags')
+    attendance_rate = models.FloatField(null=True, blank=True)
+    recent_grades = models.CharField(max_length=20, blank=True)
+    reasons = models.CharField(max_length=255)
+    flagged_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.enrollment}: {self.reasons}"
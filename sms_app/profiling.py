@@ -0,0 +1,158 @@
+import logging
+import re
+import sys
+import time
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('sms_app.sql')
+
+DEFAULT_OPTIONS = {
+    'SLOW_QUERY_MS': 100,      # log queries slower than this
+    'REPEAT_THRESHOLD': 5,     # a query shape run this often in one request is a likely N+1
+    'HISTORY': 50,             # requests kept for the debug page
+}
+PROFILE_HEADER = 'X-SQL-Profile'
+
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+def get_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, 'SMS_SQL_PROFILING_OPTIONS', {})}
+
+
+def query_shape(sql):
+    # Parameters are already placeholders; collapse IN lists so batch sizes don't split groups
+    return _IN_LIST.sub('(%s, ...)', sql)
+
+
+@dataclass
+class QueryRecord:
+    sql: str
+    duration_ms: float
+    origin: str
+    template: str
+
+
+@dataclass
+class QueryGroup:
+    shape: str
+    count: int
+    total_ms: float
+    origin: str
+    template: str
+
+
+@dataclass
+class RequestProfile:
+    path: str
+    view: str = ''
+    queries: list = field(default_factory=list)
+
+    @property
+    def total_ms(self):
+        return sum(query.duration_ms for query in self.queries)
+
+    def groups(self):
+        """Queries grouped by shape, most repeated first."""
+        groups = {}
+        for query in self.queries:
+            shape = query_shape(query.sql)
+            group = groups.get(shape)
+            if group is None:
+                groups[shape] = QueryGroup(shape, 1, query.duration_ms, query.origin, query.template)
+            else:
+                group.count += 1
+                group.total_ms += query.duration_ms
+        return sorted(groups.values(), key=lambda group: (-group.count, -group.total_ms))
+
+    def repeated(self, threshold):
+        return [group for group in self.groups() if group.count >= threshold]
+
+    def slow(self, threshold_ms):
+        return [query for query in self.queries if query.duration_ms >= threshold_ms]
+
+
+recent_profiles = deque(maxlen=get_options()['HISTORY'])
+
+
+def _caller():
+    """The innermost project source line and template node behind the running query."""
+    base_dir = str(settings.BASE_DIR)
+    origin = template = ''
+    frame = sys._getframe(2)
+    while frame is not None and not (origin and template):
+        code = frame.f_code
+        if not template and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            token = getattr(node, 'token', None)
+            if token is not None and getattr(node, 'origin', None) is not None:
+                template = f'{node.origin.template_name}:{token.lineno}'
+        elif (not origin and code.co_filename.startswith(base_dir) and code.co_filename != __file__
+              and 'site-packages' not in code.co_filename):
+            origin = f'{code.co_filename[len(base_dir) + 1:]}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return origin, template
+
+
+def _record(profile, execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        profile.queries.append(QueryRecord(sql, duration_ms, *_caller()))
+
+
+class SQLProfilerMiddleware:
+    """Record every query a request runs when settings.SMS_SQL_PROFILING is on.
+
+    Repeated query shapes (likely N+1 loops) and slow queries are logged to
+    the sms_app.sql logger with the view and source/template line that ran
+    them, a summary goes out in the X-SQL-Profile header, and recent requests
+    are kept for the sql_profile debug page. When the flag is off the
+    middleware removes itself at startup. Queries run while a streaming
+    response is consumed are not captured.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SMS_SQL_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.options = get_options()
+
+    def __call__(self, request):
+        profile = RequestProfile(path=request.get_full_path())
+        recorder = partial(_record, profile)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        profile.view = match.view_name if match else ''
+        repeated = profile.repeated(self.options['REPEAT_THRESHOLD'])
+        slow = profile.slow(self.options['SLOW_QUERY_MS'])
+        response[PROFILE_HEADER] = (
+            f'queries={len(profile.queries)}; time={profile.total_ms:.1f}ms; '
+            f'repeated={len(repeated)}; slow={len(slow)}'
+        )
+        for group in repeated:
+            logger.warning(
+                'Possible N+1 in %s: %d x %s (from %s %s)',
+                profile.view or profile.path, group.count, group.shape, group.origin, group.template,
+            )
+        for query in slow:
+            logger.warning(
+                'Slow query in %s: %.1fms %s (from %s %s)',
+                profile.view or profile.path, query.duration_ms, query.sql, query.origin, query.template,
+            )
+        if not (match and match.url_name == 'sql_profile'):
+            recent_profiles.append(profile)
+        return response
@@ -0,0 +1,106 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import touch
+from .models import AtRiskFlag, Enrollment, Grade
+
+DEFAULT_THRESHOLDS = {
+    'MIN_ATTENDANCE_RATE': 75.0,   # percent present
+    'MIN_ATTENDANCE_RECORDS': 5,   # ignore rates based on fewer records
+    'RECENT_GRADES': 3,            # how many of the latest grades to look at
+    'FAILING_GRADES': ('D', 'F'),
+    'MAX_FAILING_GRADES': 0,       # more failing recent grades than this flags the student
+}
+CHUNK_SIZE = 2000
+
+
+def get_thresholds(**overrides):
+    thresholds = {**DEFAULT_THRESHOLDS, **getattr(settings, 'SMS_AT_RISK_THRESHOLDS', {})}
+    thresholds.update({key: value for key, value in overrides.items() if value is not None})
+    return thresholds
+
+
+@dataclass
+class RiskScanResult:
+    enrollments: int = 0
+    flagged: int = 0
+    elapsed: float = 0.0
+
+
+def _recent_grades(enrollment_ids, limit):
+    grades = defaultdict(list)
+    rows = Grade.objects.filter(enrollment_id__in=enrollment_ids).order_by(
+        'enrollment_id', '-academic_year', '-semester', '-id'
+    ).values_list('enrollment_id', 'grade')
+    for enrollment_id, letter in rows:
+        if len(grades[enrollment_id]) < limit:
+            grades[enrollment_id].append(letter)
+    return grades
+
+
+def _assess(enrollment, recent, thresholds):
+    reasons = []
+    rollup = getattr(enrollment, 'attendance_rollup', None)
+    rate = rollup.rate if rollup else None
+    if (
+        rate is not None
+        and rollup.total >= thresholds['MIN_ATTENDANCE_RECORDS']
+        and rate < thresholds['MIN_ATTENDANCE_RATE']
+    ):
+        reasons.append(f'Attendance {rate}%')
+    failing = [letter for letter in recent if letter in thresholds['FAILING_GRADES']]
+    if len(failing) > thresholds['MAX_FAILING_GRADES']:
+        reasons.append(f"{len(failing)} failing grade(s): {', '.join(failing)}")
+    return rate, reasons
+
+
+def scan_enrollments(thresholds=None, chunk_size=CHUNK_SIZE):
+    """Flag enrollments whose attendance or recent grades fall below the thresholds.
+
+    Enrollments are walked in primary key order a chunk at a time, joined to
+    their student and attendance rollup, so memory stays bounded by
+    chunk_size. The AtRiskFlag table is replaced atomically.
+    """
+    thresholds = thresholds or get_thresholds()
+    result = RiskScanResult()
+    started = time.perf_counter()
+    now = timezone.now()
+
+    with transaction.atomic():
+        AtRiskFlag.objects.all().delete()
+        last_id = 0
+        while True:
+            chunk = list(
+                Enrollment.objects.filter(id__gt=last_id)
+                .select_related('student', 'attendance_rollup')
+                .order_by('id')[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            result.enrollments += len(chunk)
+
+            recent = _recent_grades([e.id for e in chunk], thresholds['RECENT_GRADES'])
+            flags = []
+            for enrollment in chunk:
+                rate, reasons = _assess(enrollment, recent.get(enrollment.id, []), thresholds)
+                if reasons:
+                    flags.append(AtRiskFlag(
+                        enrollment=enrollment,
+                        student=enrollment.student,
+                        attendance_rate=rate,
+                        recent_grades=''.join(recent.get(enrollment.id, [])),
+                        reasons='; '.join(reasons),
+                        flagged_at=now,
+                    ))
+            AtRiskFlag.objects.bulk_create(flags)
+            result.flagged += len(flags)
+
+    touch(AtRiskFlag)
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,41 @@
+from django.core.cache import cache
+
+from .metrics import record_cache
+
+TEACHERS_GROUP = 'Teachers'
+ROLE_CACHE_TIMEOUT = 60 * 60
+
+
+def _teacher_cache_key(user_id):
+    return f'sms_app:is_teacher:{user_id}'
+
+
+def is_admin(user):
+    return user.is_superuser
+
+
+def is_teacher(user):
+    if not user.is_authenticated:
+        return False
+
+    # Memoize on the user object for the rest of this request
+    cached = getattr(user, '_sms_is_teacher', None)
+    if cached is not None:
+        return cached
+
+    key = _teacher_cache_key(user.pk)
+    cached = cache.get(key)
+    record_cache('roles', cached is not None)
+    if cached is None:
+        cached = user.groups.filter(name=TEACHERS_GROUP).exists()
+        cache.set(key, cached, ROLE_CACHE_TIMEOUT)
+    user._sms_is_teacher = cached
+    return cached
+
+
+def is_admin_or_teacher(user):
+    return is_admin(user) or is_teacher(user)
+
+
+def invalidate_roles(*user_ids):
+    cache.delete_many([_teacher_cache_key(user_id) for user_id in user_ids])
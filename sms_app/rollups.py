@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import Attendance, CourseAttendanceDay, Enrollment, EnrollmentAttendance
+from .caching import touch
+from .utils import bulk_upsert
+
+REBUILD_BATCH_SIZE = 2000
+
+
+def _status_field(status):
+    return 'present' if status == 'P' else 'absent'
+
+
+def _counts():
+    return {'present': Count('id', filter=Q(status='P')), 'absent': Count('id', filter=Q(status='A'))}
+
+
+def refresh_enrollments(enrollment_ids):
+    """Recount the attendance totals of the given enrollments from raw rows."""
+    enrollment_ids = set(enrollment_ids)
+    if not enrollment_ids:
+        return
+    counts = {
+        row['enrollment_id']: row
+        for row in Attendance.objects.filter(enrollment_id__in=enrollment_ids)
+        .values('enrollment_id').annotate(**_counts()).order_by()
+    }
+    existing = set(Enrollment.objects.filter(id__in=enrollment_ids).values_list('id', flat=True))
+    bulk_upsert(
+        EnrollmentAttendance,
+        [
+            EnrollmentAttendance(
+                enrollment_id=enrollment_id,
+                present=counts.get(enrollment_id, {}).get('present', 0),
+                absent=counts.get(enrollment_id, {}).get('absent', 0),
+            )
+            for enrollment_id in existing
+        ],
+        unique_fields=['enrollment'],
+        update_fields=['present', 'absent'],
+    )
+
+
+def refresh_course_days(course_id, dates):
+    """Recount the daily attendance totals of one course from raw rows."""
+    dates = set(dates)
+    if not dates:
+        return
+    counts = {
+        row['date']: row
+        for row in Attendance.objects.filter(enrollment__course_id=course_id, date__in=dates)
+        .values('date').annotate(**_counts()).order_by()
+    }
+    with transaction.atomic():
+        bulk_upsert(
+            CourseAttendanceDay,
+            [
+                CourseAttendanceDay(course_id=course_id, date=date, present=row['present'], absent=row['absent'])
+                for date, row in counts.items()
+            ],
+            unique_fields=['course', 'date'],
+            update_fields=['present', 'absent'],
+        )
+        CourseAttendanceDay.objects.filter(course_id=course_id, date__in=dates - set(counts)).delete()
+
+
+def apply_attendance(enrollment_id, date, status, delta):
+    """Add (delta=1) or remove (delta=-1) one attendance record from the rollups."""
+    field = _status_field(status)
+    course_id = Enrollment.objects.filter(pk=enrollment_id).values_list('course_id', flat=True).first()
+    if course_id is None:
+        # The enrollment is being deleted and its rollup goes with it
+        return
+    with transaction.atomic():
+        # Atomic in-place increments. A missing row is recounted on increments
+        # only: during a cascading delete the rollup may already be gone and
+        # must not be recreated for a parent that is about to disappear.
+        updated = EnrollmentAttendance.objects.filter(enrollment_id=enrollment_id).update(**{field: F(field) + delta})
+        if not updated and delta > 0:
+            refresh_enrollments([enrollment_id])
+        updated = CourseAttendanceDay.objects.filter(course_id=course_id, date=date).update(**{field: F(field) + delta})
+        if not updated and delta > 0:
+            refresh_course_days(course_id, [date])
+        elif delta < 0:
+            # A day without any records left is dropped, as a recount would
+            CourseAttendanceDay.objects.filter(course_id=course_id, date=date, present=0, absent=0).delete()
+    touch(EnrollmentAttendance, CourseAttendanceDay)
+
+
+def rebuild_all(batch_size=REBUILD_BATCH_SIZE):
+    with transaction.atomic():
+        EnrollmentAttendance.objects.all().delete()
+        CourseAttendanceDay.objects.all().delete()
+
+        batch = []
+        for row in Attendance.objects.values('enrollment_id').annotate(**_counts()).order_by().iterator(chunk_size=batch_size):
+            batch.append(EnrollmentAttendance(**row))
+            if len(batch) >= batch_size:
+                EnrollmentAttendance.objects.bulk_create(batch)
+                batch = []
+        EnrollmentAttendance.objects.bulk_create(batch)
+
+        # Enrollments without any attendance still get a zero row
+        EnrollmentAttendance.objects.bulk_create(
+            [EnrollmentAttendance(enrollment_id=pk) for pk in
+             Enrollment.objects.filter(attendance_rollup__isnull=True).values_list('id', flat=True)],
+            batch_size=batch_size,
+        )
+
+        batch = []
+        days = Attendance.objects.values('enrollment__course_id', 'date').annotate(**_counts()).order_by()
+        for row in days.iterator(chunk_size=batch_size):
+            batch.append(CourseAttendanceDay(
+                course_id=row['enrollment__course_id'], date=row['date'],
+                present=row['present'], absent=row['absent'],
+            ))
+            if len(batch) >= batch_size:
+                CourseAttendanceDay.objects.bulk_create(batch)
+                batch = []
+        CourseAttendanceDay.objects.bulk_create(batch)
+
+    touch(EnrollmentAttendance, CourseAttendanceDay)
+    return EnrollmentAttendance.objects.count(), CourseAttendanceDay.objects.count()
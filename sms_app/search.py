@@ -0,0 +1,66 @@
+import re
+
+from django.db import connections
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+# InnoDB ignores FULLTEXT tokens shorter than innodb_ft_min_token_size (3)
+FULLTEXT_MIN_TOKEN = 3
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_course_document(course):
+    parts = [course.course_code, course.course_name, course.description]
+    if course.instructor_id and course.instructor:
+        parts += [course.instructor.first_name, course.instructor.last_name, course.instructor.username]
+    return ' '.join(part for part in parts if part)
+
+
+def search_courses(courses, query):
+    """Filter courses matching every word of query and order them by relevance.
+
+    On MySQL this uses the FULLTEXT index on Course.search_document in boolean
+    mode with prefix matching, so it stays fast as the catalogue grows. Other
+    databases fall back to substring matching on the same column.
+    """
+    terms = _TOKEN_RE.findall(query)
+    if not terms:
+        return courses
+
+    # Exact and prefix course code hits always rank first
+    code_rank = Case(
+        When(course_code__iexact=query.strip(), then=Value(2)),
+        When(course_code__istartswith=terms[0], then=Value(1)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+    if connections[courses.db].vendor == 'mysql':
+        fulltext_terms = [term for term in terms if len(term) >= FULLTEXT_MIN_TOKEN]
+        for term in terms:
+            if len(term) < FULLTEXT_MIN_TOKEN:
+                courses = courses.filter(
+                    Q(course_code__istartswith=term) | Q(search_document__icontains=term)
+                )
+        if fulltext_terms:
+            against = ' '.join(f'+{term}*' for term in fulltext_terms)
+            match = 'MATCH (sms_app_course.search_document) AGAINST (%s IN BOOLEAN MODE)'
+            courses = courses.annotate(
+                search_rank=RawSQL(match, (against,), output_field=FloatField())
+            ).filter(search_rank__gt=0)
+        else:
+            courses = courses.annotate(search_rank=Value(0.0, output_field=FloatField()))
+    else:
+        for term in terms:
+            courses = courses.filter(search_document__icontains=term)
+        courses = courses.annotate(
+            search_rank=Case(
+                When(course_name__istartswith=terms[0], then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+
+    return courses.annotate(code_rank=code_rank).order_by(
+        F('code_rank').desc(), F('search_rank').desc(), 'course_code'
+    )
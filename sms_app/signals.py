@@ -0,0 +1,256 @@
+import logging
+
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import rollups, stats, thumbnails, transcripts
+from .caching import touch
+from .models import (
+    Student, Course, Enrollment, Grade, Attendance,
+    TermGPA, EnrollmentAttendance, CourseAttendanceDay, AtRiskFlag,
+)
+from .roles import invalidate_roles
+from .search import build_course_document
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def group_membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # pk_set is not provided for clear(), so look the affected users up first
+        if reverse:
+            invalidate_roles(*instance.user_set.values_list('pk', flat=True))
+        else:
+            invalidate_roles(instance.pk)
+    elif action in ('post_add', 'post_remove'):
+        if reverse:
+            invalidate_roles(*pk_set)
+        else:
+            invalidate_roles(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate_roles(instance.pk)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=Grade)
+@receiver(post_save, sender=Attendance)
+def update_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.record_created(instance)
+    else:
+        stats.record_updated(instance)
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=Grade)
+@receiver(post_delete, sender=Attendance)
+def update_stats_on_delete(sender, instance, **kwargs):
+    stats.record_deleted(instance)
+
+
+@receiver(pre_save, sender=Course)
+def refresh_course_search_document(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance.search_document = build_course_document(instance)
+    # Remember the stored credits so GPAs can be refreshed if they change
+    if instance.pk:
+        instance._previous_credits = (
+            Course.objects.filter(pk=instance.pk).values_list('credits', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Course)
+def refresh_gpas_on_credit_change(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_credits', None)
+    if raw or created or previous is None or previous == instance.credits:
+        return
+    transcripts.refresh_student_gpas(
+        Enrollment.objects.filter(course=instance).values_list('student_id', flat=True)
+    )
+
+
+# User fields that appear in course search documents
+INSTRUCTOR_DOCUMENT_FIELDS = {'first_name', 'last_name', 'username'}
+
+
+@receiver(post_save, sender=User)
+def refresh_instructor_course_documents(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Logins save only last_login; skip anything that cannot change a document
+    if raw or created or (update_fields is not None and not INSTRUCTOR_DOCUMENT_FIELDS & set(update_fields)):
+        return
+    changed = []
+    courses = Course.objects.filter(instructor=instance).only(
+        'course_code', 'course_name', 'description', 'instructor_id', 'search_document'
+    )
+    for course in courses:
+        course.instructor = instance
+        document = build_course_document(course)
+        if document != course.search_document:
+            course.search_document = document
+            changed.append(course)
+    if changed:
+        Course.objects.bulk_update(changed, ['search_document'])
+        touch(Course)
+
+
+@receiver(pre_save, sender=Grade)
+def remember_previous_grade_term(sender, instance, raw=False, **kwargs):
+    # An edit can move a grade to another enrollment or term; both need refreshing.
+    # The stored letter lets the dashboard counters move by one instead of resetting.
+    if not raw and instance.pk:
+        previous = Grade.objects.filter(pk=instance.pk).values_list(
+            'enrollment__student_id', 'semester', 'academic_year', 'grade'
+        ).first()
+        if previous:
+            instance._previous_term, instance._previous_grade = previous[:3], previous[3]
+
+
+@receiver(post_save, sender=Grade)
+def refresh_gpa_on_grade_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    student_id = Enrollment.objects.filter(pk=instance.enrollment_id).values_list('student_id', flat=True).first()
+    transcripts.refresh_term_gpas([student_id], instance.semester, instance.academic_year)
+    previous = getattr(instance, '_previous_term', None)
+    if previous and previous != (student_id, instance.semester, instance.academic_year):
+        transcripts.refresh_term_gpas([previous[0]], previous[1], previous[2])
+
+
+@receiver(post_delete, sender=Grade)
+def refresh_gpa_on_grade_delete(sender, instance, **kwargs):
+    student_id = Enrollment.objects.filter(pk=instance.enrollment_id).values_list('student_id', flat=True).first()
+    if student_id is not None:
+        transcripts.refresh_term_gpas([student_id], instance.semester, instance.academic_year)
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_previous_attendance(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        instance._previous_attendance = Attendance.objects.filter(pk=instance.pk).values_list(
+            'enrollment_id', 'date', 'status'
+        ).first()
+
+
+@receiver(post_save, sender=Attendance)
+def update_rollups_on_attendance_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_attendance', None)
+    current = (instance.enrollment_id, instance.date, instance.status)
+    if not created and previous == current:
+        return
+    if previous:
+        rollups.apply_attendance(*previous, delta=-1)
+    rollups.apply_attendance(*current, delta=1)
+
+
+def _deleted_directly(origin, model):
+    # origin is the instance or queryset delete() was called on; anything else is a cascade
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+@receiver(post_delete, sender=Attendance)
+def update_rollups_on_attendance_delete(sender, instance, origin=None, **kwargs):
+    # Cascades from enrollments, courses and students are settled once per
+    # enrollment below instead of once per attendance row
+    if _deleted_directly(origin, Attendance):
+        rollups.apply_attendance(instance.enrollment_id, instance.date, instance.status, delta=-1)
+
+
+@receiver(pre_delete, sender=Enrollment)
+def remember_deleted_enrollment_dates(sender, instance, origin=None, **kwargs):
+    # A course's day totals cascade away with the course itself
+    if not _deleted_directly(origin, Course):
+        instance._attendance_dates = set(
+            Attendance.objects.filter(enrollment=instance).values_list('date', flat=True)
+        )
+
+
+@receiver(post_delete, sender=Enrollment)
+def update_rollups_on_enrollment_delete(sender, instance, **kwargs):
+    # The enrollment's own rollup cascades; the course day totals are recounted once
+    dates = getattr(instance, '_attendance_dates', None)
+    if dates:
+        rollups.refresh_course_days(instance.course_id, dates)
+
+
+@receiver(pre_save, sender=Enrollment)
+def remember_previous_enrollment_course(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        instance._previous_course_id = Enrollment.objects.filter(pk=instance.pk).values_list(
+            'course_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Enrollment)
+def update_rollups_on_course_change(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_course_id', None)
+    if raw or created or previous is None or previous == instance.course_id:
+        return
+    # Moving an enrollment moves its attendance between course day totals
+    dates = set(Attendance.objects.filter(enrollment=instance).values_list('date', flat=True))
+    rollups.refresh_course_days(previous, dates)
+    rollups.refresh_course_days(instance.course_id, dates)
+
+
+@receiver(pre_save, sender=Student)
+def note_new_profile_picture(sender, instance, raw=False, **kwargs):
+    # The upload is still uncommitted here; FileField writes it during save
+    picture = instance.profile_picture
+    instance._new_profile_picture = bool(picture) and not raw and not picture._committed
+
+
+@receiver(post_save, sender=Student)
+def generate_profile_thumbnails(sender, instance, raw=False, **kwargs):
+    if raw or not getattr(instance, '_new_profile_picture', False):
+        return
+    picture = instance.profile_picture
+
+    def generate():
+        try:
+            thumbnails.generate_thumbnails(picture)
+        except thumbnails.DECODE_ERRORS as exc:
+            # The upload is already saved; thumbnail_url falls back to it
+            logger.warning('Could not thumbnail %s: %s', picture.name, exc)
+
+    transaction.on_commit(generate)
+
+
+TRACKED_MODELS = (
+    User, Group, Student, Course, Enrollment, Grade, Attendance,
+    TermGPA, EnrollmentAttendance, CourseAttendanceDay, AtRiskFlag,
+)
+
+
+def record_change(sender, raw=False, update_fields=None, **kwargs):
+    # Logging in only stamps last_login, which no page shows
+    if raw or (sender is User and update_fields == {'last_login'}):
+        return
+    touch(sender)
+
+
+def record_membership_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        touch(User, Group)
+
+
+for model in TRACKED_MODELS:
+    post_save.connect(record_change, sender=model, dispatch_uid=f'sms_app_touch_save_{model._meta.label_lower}')
+    post_delete.connect(record_change, sender=model, dispatch_uid=f'sms_app_touch_delete_{model._meta.label_lower}')
+m2m_changed.connect(record_membership_change, sender=User.groups.through, dispatch_uid='sms_app_touch_groups')
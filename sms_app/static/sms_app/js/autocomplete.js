@@ -0,0 +1,53 @@
+// Typeahead for <select data-autocomplete-url="..."> widgets.
+// The server only renders the selected option; matching options are fetched
+// from the JSON endpoint as the user types.
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(function(select) {
+        var url = select.dataset.autocompleteUrl;
+        var search = document.createElement('input');
+        search.type = 'search';
+        search.className = 'form-control mb-1';
+        search.placeholder = 'Type to search...';
+        search.autocomplete = 'off';
+        select.parentNode.insertBefore(search, select);
+
+        var timer = null;
+        var latest = 0;
+
+        function load(query) {
+            var request = ++latest;
+            fetch(url + '?' + new URLSearchParams({q: query}), {credentials: 'same-origin'})
+                .then(function(response) { return response.json(); })
+                .then(function(data) {
+                    if (request !== latest) {
+                        return;
+                    }
+                    var current = select.value;
+                    var keep = select.selectedOptions.length ? select.selectedOptions[0] : null;
+                    select.innerHTML = '';
+                    select.appendChild(new Option('---------', ''));
+                    if (keep && keep.value && !data.results.some(function(r) { return String(r.id) === current; })) {
+                        select.appendChild(keep);
+                    }
+                    data.results.forEach(function(result) {
+                        select.appendChild(new Option(result.text, result.id, false, String(result.id) === current));
+                    });
+                    if (data.has_more) {
+                        var more = new Option('Keep typing to narrow the results...', '');
+                        more.disabled = true;
+                        select.appendChild(more);
+                    }
+                });
+        }
+
+        search.addEventListener('input', function() {
+            clearTimeout(timer);
+            timer = setTimeout(function() { load(search.value.trim()); }, 200);
+        });
+        search.addEventListener('focus', function() {
+            if (select.options.length <= 2) {
+                load(search.value.trim());
+            }
+        }, {once: true});
+    });
+});
@@ -0,0 +1,162 @@
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .metrics import record_cache
+from .models import Student, Course, Enrollment, Grade, Attendance, CourseAttendanceDay
+
+STATS_CACHE_TIMEOUT = 60 * 60
+RECENT_ENROLLMENTS = 5
+
+TOTAL_MODELS = {
+    'students': Student,
+    'courses': Course,
+    'enrollments': Enrollment,
+    'grades': Grade,
+}
+
+
+def _key(name):
+    return f'sms_app:stats:{name}'
+
+
+def _grade_key(letter):
+    return _key(f'grade:{letter}')
+
+
+def _attendance_key(date, status):
+    return _key(f'attendance:{date.isoformat()}:{status}')
+
+
+def _recent_enrollments():
+    return [
+        {
+            'student_name': f'{e.student.first_name} {e.student.last_name}',
+            'student_id': e.student.student_id,
+            'course_code': e.course.course_code,
+            'course_name': e.course.course_name,
+            'enrollment_date': e.enrollment_date,
+        }
+        for e in Enrollment.objects.select_related('student', 'course').order_by('-id')[:RECENT_ENROLLMENTS]
+    ]
+
+
+def get_dashboard_stats():
+    today = timezone.localdate()
+    grade_letters = [value for value, label in Grade.GRADE_CHOICES]
+    keys = (
+        [_key(name) for name in TOTAL_MODELS]
+        + [_grade_key(letter) for letter in grade_letters]
+        + [_attendance_key(today, 'P'), _attendance_key(today, 'A'), _key('recent_enrollments')]
+    )
+    cached = cache.get_many(keys)
+
+    # Seed whatever is missing; after that the signal handlers keep it current
+    missing = {}
+    for name, model in TOTAL_MODELS.items():
+        if _key(name) not in cached:
+            missing[_key(name)] = model.objects.count()
+    if any(_grade_key(letter) not in cached for letter in grade_letters):
+        counts = dict(Grade.objects.values_list('grade').annotate(total=Count('id')).order_by())
+        for letter in grade_letters:
+            missing[_grade_key(letter)] = counts.get(letter, 0)
+    if _attendance_key(today, 'P') not in cached or _attendance_key(today, 'A') not in cached:
+        totals = CourseAttendanceDay.objects.filter(date=today).aggregate(present=Sum('present'), absent=Sum('absent'))
+        missing[_attendance_key(today, 'P')] = totals['present'] or 0
+        missing[_attendance_key(today, 'A')] = totals['absent'] or 0
+    if _key('recent_enrollments') not in cached:
+        missing[_key('recent_enrollments')] = _recent_enrollments()
+    record_cache('stats', not missing)
+    if missing:
+        cache.set_many(missing, STATS_CACHE_TIMEOUT)
+        cached.update(missing)
+
+    present = cached[_attendance_key(today, 'P')]
+    absent = cached[_attendance_key(today, 'A')]
+    total_grades = cached[_key('grades')]
+    return {
+        **{f'total_{name}': cached[_key(name)] for name in TOTAL_MODELS},
+        'attendance_today': present + absent,
+        'attendance_rate_today': round(100 * present / (present + absent), 1) if present + absent else None,
+        'grade_distribution': [
+            {
+                'grade': letter,
+                'count': cached[_grade_key(letter)],
+                'percent': round(100 * cached[_grade_key(letter)] / total_grades, 1) if total_grades else 0,
+            }
+            for letter in grade_letters
+        ],
+        'recent_enrollments': cached[_key('recent_enrollments')],
+    }
+
+
+def _adjust(key, delta):
+    # Counters that are not cached yet are seeded on the next dashboard view
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass
+
+
+def record_created(instance):
+    model = type(instance)
+    for name, total_model in TOTAL_MODELS.items():
+        if model is total_model:
+            _adjust(_key(name), 1)
+    if model is Grade:
+        _adjust(_grade_key(instance.grade), 1)
+    elif model is Attendance:
+        _adjust(_attendance_key(instance.date, instance.status), 1)
+    if model in (Enrollment, Student, Course):
+        cache.delete(_key('recent_enrollments'))
+
+
+def record_deleted(instance):
+    model = type(instance)
+    for name, total_model in TOTAL_MODELS.items():
+        if model is total_model:
+            _adjust(_key(name), -1)
+    if model is Grade:
+        _adjust(_grade_key(instance.grade), -1)
+    elif model is Attendance:
+        _adjust(_attendance_key(instance.date, instance.status), -1)
+    if model in (Enrollment, Student, Course):
+        cache.delete(_key('recent_enrollments'))
+
+
+def record_updated(instance):
+    # The pre_save handlers in signals.py remember the stored values; move the
+    # counters from those to the new ones, or drop them if they are unknown
+    model = type(instance)
+    if model is Grade:
+        previous = getattr(instance, '_previous_grade', None)
+        if previous is None:
+            invalidate_grade_stats()
+        elif previous != instance.grade:
+            _adjust(_grade_key(previous), -1)
+            _adjust(_grade_key(instance.grade), 1)
+    elif model is Attendance:
+        previous = getattr(instance, '_previous_attendance', None)
+        if previous is None:
+            invalidate_attendance_stats(instance.date, timezone.localdate())
+        elif previous[1:] != (instance.date, instance.status):
+            _adjust(_attendance_key(previous[1], previous[2]), -1)
+            _adjust(_attendance_key(instance.date, instance.status), 1)
+    elif model in (Enrollment, Student, Course):
+        cache.delete(_key('recent_enrollments'))
+
+
+def invalidate_grade_stats():
+    cache.delete_many([_key('grades')] + [_grade_key(letter) for letter, label in Grade.GRADE_CHOICES])
+
+
+def invalidate_attendance_stats(*dates):
+    dates = dates or (timezone.localdate(),)
+    cache.delete_many([_attendance_key(date, status) for date in dates for status in ('P', 'A')])
+
+
+def invalidate_dashboard_stats():
+    # For bulk writes, which do not send model signals
+    cache.delete_many([_key(name) for name in TOTAL_MODELS] + [_key('recent_enrollments')])
+    invalidate_grade_stats()
+    invalidate_attendance_stats()
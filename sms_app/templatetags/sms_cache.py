@@ -0,0 +1,16 @@
+from django import template
+from django.apps import apps
+
+from ..caching import last_changed
+
+register = template.Library()
+
+
+@register.simple_tag
+def change_stamp(*labels):
+    """Latest change stamp of the named models, e.g. 'sms_app.Grade'.
+
+    Used as part of {% cache %} keys so row fragments expire when any of the
+    rows they render from changes.
+    """
+    return last_changed(*(apps.get_model(label) for label in labels))
@@ -0,0 +1,11 @@
+from django import template
+
+from ..thumbnails import thumbnail_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail(field_file, size='medium', fmt='jpeg'):
+    """{% thumbnail student.profile_picture 'small' 'webp' %} -> URL of that size."""
+    return thumbnail_url(field_file, size, fmt)
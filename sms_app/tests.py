@@ -1,3 +1,582 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+
+from . import caching, rollups, stats, thumbnails, transcripts
+from .importers import import_students
+from .models import (
+    Attendance, Course, CourseAttendanceDay, Enrollment, EnrollmentAttendance, Grade, Student, TermGPA,
+)
+
+
+def _rollup_state():
+    return (
+        set(EnrollmentAttendance.objects.values_list('enrollment_id', 'present', 'absent')),
+        set(CourseAttendanceDay.objects.values_list('course_id', 'date', 'present', 'absent')),
+    )
+
+
+def _gpa_state():
+    return set(TermGPA.objects.values_list('student_id', 'semester', 'academic_year', 'credits', 'quality_points'))
+
+
+class InstitutionTestCase(TestCase):
+    """Two courses of three students with grades and three days of attendance."""
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.courses = [
+            Course.objects.create(course_code=f'C{i}', course_name=f'Course {i}', credits=i + 2)
+            for i in range(2)
+        ]
+        self.students = [
+            Student.objects.create(
+                student_id=f'S{i}', first_name='First', last_name=f'Last{i}',
+                email=f's{i}@example.com', date_of_birth=datetime.date(2000, 1, 1),
+            )
+            for i in range(3)
+        ]
+        for student in self.students:
+            for course in self.courses:
+                enrollment = Enrollment.objects.create(student=student, course=course)
+                Grade.objects.create(enrollment=enrollment, grade='AB'[student.id % 2], semester='Fall', academic_year='2024-2025')
+                for days in range(3):
+                    Attendance.objects.create(
+                        enrollment=enrollment, date=self.today - datetime.timedelta(days=days), status='PA'[days % 2],
+                    )
+
+    def assertInSync(self):
+        maintained_rollups, maintained_gpas = _rollup_state(), _gpa_state()
+        dashboard = stats.get_dashboard_stats()
+        rollups.rebuild_all()
+        transcripts.rebuild_all_gpas()
+        cache.clear()
+        self.assertEqual(maintained_rollups, _rollup_state())
+        self.assertEqual(maintained_gpas, _gpa_state())
+        self.assertEqual(dashboard, stats.get_dashboard_stats())
+
+    def seed_dashboard(self):
+        # Counters are only adjusted once the dashboard has seeded them
+        stats.get_dashboard_stats()
+
+
+class DenormalizedDataTests(InstitutionTestCase):
+    """The maintained rollups, GPAs, counters and stamps match a full recount."""
+
+    def test_create(self):
+        self.seed_dashboard()
+        enrollment = Enrollment.objects.create(student=self.students[0], course=Course.objects.create(
+            course_code='C9', course_name='Course 9',
+        ))
+        Grade.objects.create(enrollment=enrollment, grade='C', semester='Spring', academic_year='2024-2025')
+        Attendance.objects.create(enrollment=enrollment, date=self.today, status='A')
+        self.assertInSync()
+
+    def test_update(self):
+        self.seed_dashboard()
+        grade = Grade.objects.first()
+        grade.grade = 'F'
+        grade.save()
+        attendance = Attendance.objects.filter(date=self.today).first()
+        attendance.status = 'A'
+        attendance.save()
+        course = self.courses[0]
+        course.credits = 5
+        course.save()
+        self.assertInSync()
+
+    def test_grade_edit_keeps_counters_cached(self):
+        self.seed_dashboard()
+        grade = Grade.objects.filter(grade='A').first()
+        grade.semester = 'Spring'
+        grade.save()
+        grade.grade = 'C'
+        grade.save()
+        self.assertEqual(
+            cache.get_many([stats._key('grades'), stats._grade_key('A'), stats._grade_key('C')]),
+            {stats._key('grades'): 6, stats._grade_key('A'): 1, stats._grade_key('C'): 1},
+        )
+        self.assertInSync()
+
+    def test_attendance_edit_keeps_counters_cached(self):
+        self.seed_dashboard()
+        attendance = Attendance.objects.filter(date=self.today).first()
+        attendance.status = 'A'
+        attendance.save()
+        self.assertEqual(
+            cache.get_many([stats._attendance_key(self.today, 'P'), stats._attendance_key(self.today, 'A')]),
+            {stats._attendance_key(self.today, 'P'): 5, stats._attendance_key(self.today, 'A'): 1},
+        )
+        self.assertInSync()
+
+    def test_delete(self):
+        self.seed_dashboard()
+        Grade.objects.first().delete()
+        Attendance.objects.filter(date=self.today).first().delete()
+        Attendance.objects.filter(date=self.today - datetime.timedelta(days=1)).delete()
+        self.assertInSync()
+
+    def test_cascade_delete_enrollment(self):
+        self.seed_dashboard()
+        Enrollment.objects.first().delete()
+        self.assertInSync()
+
+    def test_cascade_delete_student(self):
+        self.seed_dashboard()
+        self.students[1].delete()
+        self.assertInSync()
+
+    def test_cascade_delete_course(self):
+        self.seed_dashboard()
+        Course.objects.filter(pk=self.courses[0].pk).delete()
+        self.assertInSync()
+
+    def test_change_stamps_advance(self):
+        for model, write in [
+            (Grade, lambda: Grade.objects.first().save()),
+            (Grade, lambda: Grade.objects.first().delete()),
+            (Attendance, lambda: Attendance.objects.first().save()),
+            (Student, lambda: self.students[2].delete()),
+        ]:
+            cache.set(caching._stamp_key(model._meta.label_lower), 0, None)
+            write()
+            self.assertGreater(caching.last_changed(model), 0)
+
+
+class AttendanceListTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Group.objects.create(name='Teachers')
+        course = Course.objects.create(course_code='C1', course_name='Course 1')
+        for i in range(3):
+            enrollment = Enrollment.objects.create(course=course, student=Student.objects.create(
+                student_id=f'S{i}', first_name='A', last_name='B', email='a@example.com',
+                date_of_birth=datetime.date(2000, 1, 1),
+            ))
+            for day in range(40):
+                Attendance.objects.create(enrollment=enrollment, date=datetime.date(2025, 1, 1) + datetime.timedelta(days=day), status='P')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_cursor_walks_every_row_newest_first(self):
+        seen, url = [], '/attendance/'
+        while url:
+            response = self.client.get(url)
+            seen += [(row.date, row.id) for row in response.context['attendances']]
+            cursor = response.context['next_cursor']
+            url = f'/attendance/?cursor={cursor}' if cursor else None
+        self.assertEqual(seen, sorted(Attendance.objects.values_list('date', 'id'), reverse=True))
+
+    def test_cursor_respects_filters(self):
+        response = self.client.get('/attendance/?date_from=2025-02-01&date_to=2025-02-09')
+        self.assertEqual(len(response.context['attendances']), 27)
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_invalid_dates(self):
+        for url in [
+            '/attendance/?cursor=2024-02-30.5',
+            '/attendance/?date_from=2024-02-30',
+            '/export/attendance.csv?date_from=2024-02-30',
+            '/api/v1/attendance/?date_from=2024-02-30',
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class AutocompleteTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Group.objects.create(name='Teachers')
+        self.students = [
+            Student.objects.create(
+                student_id=f'S{i}', first_name=name, last_name='Doe', email='a@example.com',
+                date_of_birth=datetime.date(2000, 1, 1),
+            )
+            for i, name in enumerate(['Ann', 'Andy', 'Bob'])
+        ]
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_form_renders_only_the_selected_option(self):
+        response = self.client.post('/enrollments/add/', {'student': self.students[1].pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Andy Doe (S1)')
+        self.assertNotContains(response, 'Ann Doe (S0)')
+
+    def test_invalid_selected_values_are_form_errors(self):
+        self.assertEqual(self.client.post('/grades/add/', {'enrollment': 'abc'}).status_code, 200)
+        self.assertEqual(self.client.post('/enrollments/add/', {'student': 'x'}).status_code, 200)
+
+    def test_endpoint_searches_and_pages(self):
+        body = self.client.get('/autocomplete/students/?q=an&limit=1').json()
+        self.assertEqual(body, {'results': [{'id': self.students[1].pk, 'text': 'Andy Doe (S1)'}], 'has_more': True})
+        body = self.client.get('/autocomplete/students/?q=an&limit=1&offset=1').json()
+        self.assertEqual(body, {'results': [{'id': self.students[0].pk, 'text': 'Ann Doe (S0)'}], 'has_more': False})
+
+
+class ImportStudentsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Student.objects.create(
+            student_id='S1', first_name='Old', last_name='Name', email='old@example.com',
+            phone='555-1234', address='1 Main St', date_of_birth=datetime.date(2000, 1, 1),
+        )
+
+    def test_creates_and_updates_by_student_id(self):
+        result = import_students(io.StringIO(
+            'student_id,first_name,last_name,email,phone,address,date_of_birth\n'
+            'S1,New,Name,new@example.com,555-0000,2 Side St,2000-01-02\n'
+            'S2,Second,Student,s2@example.com,,,2001-05-06\n'
+        ))
+        self.assertEqual((result.rows, result.created, result.updated, result.errors), (2, 1, 1, []))
+        student = Student.objects.get(student_id='S1')
+        self.assertEqual(
+            (student.first_name, student.email, student.phone, student.address, student.date_of_birth),
+            ('New', 'new@example.com', '555-0000', '2 Side St', datetime.date(2000, 1, 2)),
+        )
+        self.assertTrue(Student.objects.filter(student_id='S2').exists())
+
+    def test_missing_optional_columns_keep_stored_values(self):
+        result = import_students(io.StringIO(
+            'student_id,first_name,last_name,email,date_of_birth\n'
+            'S1,New,Name,old@example.com,2000-01-01\n'
+        ))
+        self.assertEqual((result.updated, result.errors), (1, []))
+        student = Student.objects.get(student_id='S1')
+        self.assertEqual((student.first_name, student.phone, student.address), ('New', '555-1234', '1 Main St'))
+
+    def test_reports_invalid_and_duplicate_rows(self):
+        result = import_students(io.StringIO(
+            'student_id,first_name,last_name,email,date_of_birth\n'
+            'S3,A,B,not-an-email,2000-01-01\n'
+            'S4,A,B,a@example.com,2000-01-01\n'
+            'S4,A,B,a@example.com,2000-01-01\n'
+        ))
+        self.assertEqual((result.created, result.duplicates), (1, 1))
+        self.assertEqual([line for line, message in result.errors], [2, 4])
+
+    def test_missing_required_column(self):
+        result = import_students(io.StringIO('student_id,first_name\nS5,A\n'))
+        self.assertEqual(result.rows, 0)
+        self.assertIn('date_of_birth', result.errors[0][1])
+
+    def test_command_rejects_undecodable_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.csv') as f:
+            f.write('student_id,first_name,last_name,email,date_of_birth\nS6,Jos\u00e9,B,a@example.com,2000-01-01\n'.encode('latin-1'))
+            f.flush()
+            with self.assertRaisesMessage(CommandError, 'Could not read'):
+                call_command('import_students', f.name, stdout=io.StringIO(), stderr=io.StringIO())
+
+    def test_admin_upload_rejects_undecodable_file(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.post('/admin/sms_app/student/import/', {'csv_file': SimpleUploadedFile(
+            'students.csv', 'student_id,first_name\nS6,Jos\u00e9\n'.encode('latin-1'),
+        )})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'not a readable UTF-8 CSV file')
+
+
+class ProfileThumbnailTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def add_student(self, picture):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/students/add/', {
+                'student_id': 'S1', 'first_name': 'A', 'last_name': 'B', 'email': 'a@example.com',
+                'date_of_birth': '2000-01-01', 'profile_picture': SimpleUploadedFile('face.jpg', picture),
+            })
+
+    def jpeg(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 300), 'red').save(buffer, 'JPEG')
+        return buffer.getvalue()
+
+    def test_upload_writes_thumbnails(self):
+        self.assertEqual(self.add_student(self.jpeg()).status_code, 302)
+        picture = Student.objects.get().profile_picture
+        digest = thumbnails._source_digest(picture)
+        self.assertTrue(default_storage.exists(thumbnails.thumbnail_name(digest, 'medium', 'webp')))
+
+    def test_truncated_upload_falls_back_to_original(self):
+        with self.assertLogs('sms_app.signals', 'WARNING'):
+            response = self.add_student(self.jpeg()[:-50])
+        self.assertEqual(response.status_code, 302)
+        picture = Student.objects.get().profile_picture
+        with self.assertLogs('sms_app.thumbnails', 'WARNING'):
+            self.assertEqual(thumbnails.thumbnail_url(picture), picture.url)
+
+
+class CachedPageTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.teachers = Group.objects.create(name='Teachers')
+        self.instructor = User.objects.create_user('teach', 'teach@example.com', 'pw')
+        self.instructor.groups.add(self.teachers)
+        self.course = Course.objects.create(course_code='C1', course_name='Course 1', instructor=self.instructor)
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.admin)
+
+    def test_unchanged_page_revalidates(self):
+        response = self.client.get('/courses/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/courses/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_write_invalidates_page(self):
+        etag = self.client.get('/courses/')['ETag']
+        Course.objects.create(course_code='C2', course_name='Course 2')
+        response = self.client.get('/courses/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Course 2')
+
+    def test_role_change_invalidates_page(self):
+        etag = self.client.get('/courses/')['ETag']
+        self.admin.groups.add(self.teachers)
+        self.assertNotEqual(self.client.get('/courses/')['ETag'], etag)
+
+    def test_instructor_detail_counts_new_enrollments(self):
+        url = f'/instructors/{self.instructor.pk}/'
+        self.assertContains(self.client.get(url), '0 student(s)')
+        Enrollment.objects.create(course=self.course, student=Student.objects.create(
+            student_id='S1', first_name='A', last_name='B', email='a@example.com', date_of_birth=datetime.date(2000, 1, 1),
+        ))
+        self.assertContains(self.client.get(url), '1 student(s)')
+
+    def test_login_keeps_pages_cached(self):
+        etag = self.client.get('/courses/')['ETag']
+        self.assertTrue(self.client.login(username='teach', password='pw'))
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get('/courses/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+@override_settings(SMS_API_TOKENS={'s3cret': 'timetable'})
+class ApiTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.instructor = User.objects.create_user('teach', 'teach@example.com', 'pw')
+        self.courses = [
+            Course.objects.create(course_code=f'C{i}', course_name=f'Course {i}', instructor=self.instructor if i else None)
+            for i in range(3)
+        ]
+        self.user = User.objects.create_user('timetable', 'tt@example.com', 'pw')
+        self.client.force_login(self.user)
+
+    def get(self, url, **headers):
+        response = self.client.get(url, headers=headers)
+        return response, response.json() if response.status_code == 200 else None
+
+    def test_fields_and_include(self):
+        response, body = self.get('/api/v1/courses/?fields=course_code&include=instructor')
+        self.assertEqual(body['data'][0], {'id': self.courses[0].id, 'course_code': 'C0', 'instructor': None})
+        self.assertEqual(body['data'][1]['instructor']['username'], 'teach')
+        self.assertEqual(self.get('/api/v1/courses/?fields=password')[0].status_code, 400)
+        self.assertEqual(self.get('/api/v1/courses/?include=students')[0].status_code, 400)
+
+    def test_cursor_pages_through_collection(self):
+        codes, url = [], '/api/v1/courses/?limit=2'
+        while url:
+            body = self.get(url)[1]
+            codes += [course['course_code'] for course in body['data']]
+            cursor = body['meta']['next_cursor']
+            url = f'/api/v1/courses/?limit=2&cursor={cursor}' if cursor else None
+        self.assertEqual(codes, ['C0', 'C1', 'C2'])
+
+    def test_etag(self):
+        response = self.get(f'/api/v1/courses/{self.courses[0].id}/')[0]
+        self.assertEqual(self.get(f'/api/v1/courses/{self.courses[0].id}/', if_none_match=response['ETag'])[0].status_code, 304)
+        Course.objects.filter(pk=self.courses[0].pk).update(course_name='Renamed')
+        self.assertEqual(self.get(f'/api/v1/courses/{self.courses[0].id}/', if_none_match=response['ETag'])[0].status_code, 200)
+
+    def test_bearer_token(self):
+        self.client.logout()
+        self.assertEqual(self.get('/api/v1/courses/')[0].status_code, 401)
+        self.assertEqual(self.get('/api/v1/courses/', authorization='Bearer wrong')[0].status_code, 401)
+        response, body = self.get('/api/v1/courses/', authorization='Bearer s3cret')
+        self.assertEqual(len(body['data']), 3)
+
+    def test_token_of_inactive_user_is_rejected(self):
+        self.client.logout()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.get('/api/v1/courses/', authorization='Bearer s3cret')[0].status_code, 401)
+
+
+class EnrollmentListTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Group.objects.create(name='Teachers')
+        courses = [Course.objects.create(course_code=f'C{i}', course_name=f'Course {i}') for i in range(3)]
+        for i in range(20):
+            student = Student.objects.create(
+                student_id=f'S{i:02d}', first_name='A', last_name='B', email='a@example.com',
+                date_of_birth=datetime.date(2000, 1, 1),
+            )
+            for course in courses:
+                Enrollment.objects.create(student=student, course=course)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_pages_without_per_row_queries(self):
+        with CaptureQueriesContext(connection) as first_page:
+            response = self.client.get('/enrollments/')
+        self.assertEqual(len(response.context['enrollments']), 50)
+        self.assertContains(response, 'Page 1 of 2')
+        cache.clear()
+        with CaptureQueriesContext(connection) as last_page:
+            response = self.client.get('/enrollments/?page=2')
+        self.assertEqual(len(response.context['enrollments']), 10)
+        self.assertEqual(len(first_page), len(last_page))
+
+
+class GenerateDatasetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def generate(self):
+        call_command('generate_dataset', students=20, courses=8, terms=1, weeks=1, stdout=io.StringIO())
+
+    def test_generates_consistent_dataset(self):
+        self.generate()
+        self.assertEqual((Student.objects.count(), Course.objects.count()), (20, 8))
+        maintained = _rollup_state(), _gpa_state()
+        rollups.rebuild_all()
+        transcripts.rebuild_all_gpas()
+        self.assertEqual(maintained, (_rollup_state(), _gpa_state()))
+
+    def test_refuses_existing_courses_and_instructors(self):
+        Course.objects.create(course_code='CS102', course_name='Data Structures')
+        with self.assertRaisesMessage(CommandError, 'students or courses'):
+            self.generate()
+        Course.objects.all().delete()
+        User.objects.create_user('instructor00001')
+        with self.assertRaisesMessage(CommandError, 'already taken'):
+            self.generate()
+        self.assertEqual(User.objects.count(), 1)
+
+
+class RollCallTests(InstitutionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        Group.objects.create(name='Teachers')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.enrollments = list(Enrollment.objects.filter(course=self.courses[0]).order_by('id'))
+
+    def test_get_prefills_recorded_statuses(self):
+        Attendance.objects.filter(enrollment=self.enrollments[0], date=self.today).update(status='A')
+        response = self.client.get('/attendance/roll-call/', {'course': self.courses[0].pk, 'date': self.today})
+        self.assertEqual([e.current_status for e in response.context['enrollments']], ['A', 'P', 'P'])
+
+    def test_post_records_the_whole_course(self):
+        self.seed_dashboard()
+        new_day = self.today + datetime.timedelta(days=1)
+        for date, statuses in [(self.today, 'AAP'), (new_day, 'PA')]:
+            response = self.client.post('/attendance/roll-call/', {
+                'course': self.courses[0].pk, 'date': date,
+                **{f'status_{e.id}': status for e, status in zip(self.enrollments, statuses)},
+            })
+            self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            list(Attendance.objects.filter(enrollment__course=self.courses[0], date=self.today)
+                 .order_by('enrollment_id').values_list('status', flat=True)),
+            ['A', 'A', 'P'],
+        )
+        # The student without a submitted status is left unrecorded
+        self.assertEqual(Attendance.objects.filter(date=new_day).count(), 2)
+        self.assertInSync()
+
+
+class GradebookTests(InstitutionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        Group.objects.create(name='Teachers')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.enrollments = list(Enrollment.objects.filter(course=self.courses[0]).order_by('id'))
+        self.term = {'course': self.courses[0].pk, 'semester': 'Fall', 'academic_year': '2024-2025'}
+
+    def test_get_prefills_current_grades(self):
+        response = self.client.get('/grades/gradebook/', self.term)
+        self.assertEqual(
+            [e.current_grade for e in response.context['enrollments']],
+            [Grade.objects.get(enrollment=e).grade for e in response.context['enrollments']],
+        )
+
+    def test_post_adds_updates_and_clears_grades(self):
+        self.seed_dashboard()
+        first, second, third = self.enrollments
+        response = self.client.post('/grades/gradebook/', {
+            **self.term, f'grade_{first.id}': 'D', f'grade_{second.id}': '', f'grade_{third.id}': 'Z',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Grade.objects.get(enrollment=first).grade, 'D')
+        self.assertFalse(Grade.objects.filter(enrollment=second).exists())
+        # An unknown letter leaves the stored grade alone
+        self.assertEqual(Grade.objects.filter(enrollment=third).count(), 1)
+
+        response = self.client.post('/grades/gradebook/', {
+            **self.term, 'semester': 'Spring', f'grade_{second.id}': 'A',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Grade.objects.filter(enrollment=second, semester='Spring').get().grade, 'A')
+        self.assertInSync()
+
+
+@mock.patch('sms_app.exporters.EXPORT_CHUNK_SIZE', 4)
+class ExportTests(InstitutionTestCase):
+    """Exports page in chunks of 4 here, so several pages split a single date."""
+
+    def setUp(self):
+        super().setUp()
+        Group.objects.create(name='Teachers')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def download(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        return list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_attendance_export_pages_on_date_and_id(self):
+        rows = self.download('/export/attendance.csv')
+        self.assertEqual(rows[0], ['date', 'student_id', 'first_name', 'last_name', 'course_code', 'status'])
+        expected = Attendance.objects.order_by('date', 'id').values_list(
+            'date', 'enrollment__student__student_id', 'status'
+        )
+        self.assertEqual([(row[0], row[1], row[5]) for row in rows[1:]], [
+            (date.isoformat(), student_id, status) for date, student_id, status in expected
+        ])
+
+    def test_export_applies_list_filters(self):
+        rows = self.download(f'/export/grades.csv?course={self.courses[1].course_code}')
+        self.assertEqual(len(rows) - 1, 3)
+        self.assertEqual({row[3] for row in rows[1:]}, {self.courses[1].course_code})
+
+    def test_command_writes_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.csv') as f:
+            stdout = io.StringIO()
+            call_command('export_data', 'enrollments', output=f.name, stdout=stdout)
+            self.assertIn('Exported 6 enrollments row(s)', stdout.getvalue())
+            with open(f.name, newline='') as exported:
+                self.assertEqual(len(list(csv.reader(exported))), 7)
@@ -0,0 +1,104 @@
+import hashlib
+import logging
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Square edge length in pixels for each named size
+DEFAULT_SIZES = {
+    'small': 48,
+    'medium': 150,
+    'large': 300,
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+THUMBNAIL_DIR = 'thumbs'
+# What a corrupt, unsupported or oversized upload raises while decoding
+DECODE_ERRORS = (OSError, UnidentifiedImageError, Image.DecompressionBombError)
+
+
+def get_sizes():
+    return {**DEFAULT_SIZES, **getattr(settings, 'SMS_THUMBNAIL_SIZES', {})}
+
+
+def _source_digest(field_file):
+    # Hashing means reading the whole upload, so remember it per stored name
+    key = f'sms_app:thumb:{hashlib.md5(field_file.name.encode(), usedforsecurity=False).hexdigest()}'
+    digest = cache.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with field_file.storage.open(field_file.name, 'rb') as source:
+            for chunk in iter(lambda: source.read(64 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()[:20]
+        cache.set(key, digest, None)
+    return digest
+
+
+def thumbnail_name(digest, size, fmt):
+    return f'{THUMBNAIL_DIR}/{digest[:2]}/{digest}-{size}.{fmt}'
+
+
+def _render(image, edge, fmt):
+    # Copying the pixels into a fresh RGB image leaves EXIF, GPS and ICC data behind
+    thumb = ImageOps.fit(image, (edge, edge), Image.LANCZOS).convert('RGB')
+    clean = Image.new('RGB', thumb.size)
+    clean.paste(thumb)
+    pil_format, options = FORMATS[fmt]
+    buffer = BytesIO()
+    clean.save(buffer, pil_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_thumbnails(field_file, sizes=None, formats=None):
+    """Write every missing size/format of field_file; returns the names written."""
+    sizes = sizes or list(get_sizes())
+    formats = formats or list(FORMATS)
+    digest = _source_digest(field_file)
+    edges = get_sizes()
+    pending = [
+        (size, fmt) for size in sizes for fmt in formats
+        if not default_storage.exists(thumbnail_name(digest, size, fmt))
+    ]
+    if not pending:
+        return []
+
+    with field_file.storage.open(field_file.name, 'rb') as source:
+        image = Image.open(source)
+        # Apply the camera orientation before the EXIF tag is dropped
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    written = []
+    for size, fmt in pending:
+        name = thumbnail_name(digest, size, fmt)
+        default_storage.save(name, _render(image, edges[size], fmt))
+        written.append(name)
+    return written
+
+
+def thumbnail_url(field_file, size='medium', fmt='jpeg'):
+    """URL of a cached thumbnail, generating it on first request.
+
+    Falls back to the original upload if it cannot be decoded.
+    """
+    if not field_file:
+        return ''
+    if size not in get_sizes() or fmt not in FORMATS:
+        raise ValueError(f'Unknown thumbnail {size!r}/{fmt!r}')
+    try:
+        name = thumbnail_name(_source_digest(field_file), size, fmt)
+        if not default_storage.exists(name):
+            generate_thumbnails(field_file, sizes=[size], formats=[fmt])
+    except DECODE_ERRORS as exc:
+        logger.warning('Could not thumbnail %s: %s', field_file.name, exc)
+        return field_file.url
+    return default_storage.url(name)
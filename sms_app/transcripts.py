@@ -0,0 +1,134 @@
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+
+from .models import Grade, TermGPA
+from .caching import touch
+from .utils import bulk_upsert
+
+REBUILD_BATCH_SIZE = 2000
+
+
+def _grade_points():
+    return Case(
+        *[When(grade=letter, then=Value(points)) for letter, points in Grade.GRADE_POINTS.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _term_totals(grades):
+    return grades.values(
+        'enrollment__student_id', 'semester', 'academic_year'
+    ).annotate(
+        credits=Sum('enrollment__course__credits'),
+        quality_points=Sum(_grade_points() * F('enrollment__course__credits')),
+    ).order_by()
+
+
+def _write_term_totals(rows):
+    bulk_upsert(
+        TermGPA,
+        [
+            TermGPA(
+                student_id=row['enrollment__student_id'],
+                semester=row['semester'],
+                academic_year=row['academic_year'],
+                credits=row['credits'] or 0,
+                quality_points=row['quality_points'] or 0,
+            )
+            for row in rows
+        ],
+        unique_fields=['student', 'semester', 'academic_year'],
+        update_fields=['credits', 'quality_points', 'updated_at'],
+    )
+
+
+def refresh_term_gpas(student_ids, semester, academic_year):
+    """Recompute the materialized GPA of one term for the given students."""
+    student_ids = set(student_ids)
+    if not student_ids:
+        return
+    rows = list(_term_totals(Grade.objects.filter(
+        enrollment__student_id__in=student_ids, semester=semester, academic_year=academic_year
+    )))
+    with transaction.atomic():
+        _write_term_totals(rows)
+        # Terms whose last grade was removed no longer count
+        graded = {row['enrollment__student_id'] for row in rows}
+        TermGPA.objects.filter(
+            student_id__in=student_ids - graded, semester=semester, academic_year=academic_year
+        ).delete()
+
+
+def refresh_student_gpas(student_ids):
+    """Recompute every term for the given students, e.g. after a credits change."""
+    student_ids = set(student_ids)
+    if not student_ids:
+        return
+    rows = list(_term_totals(Grade.objects.filter(enrollment__student_id__in=student_ids)))
+    with transaction.atomic():
+        TermGPA.objects.filter(student_id__in=student_ids).delete()
+        _write_term_totals(rows)
+
+
+def rebuild_all_gpas(batch_size=REBUILD_BATCH_SIZE):
+    with transaction.atomic():
+        TermGPA.objects.all().delete()
+        batch = []
+        for row in _term_totals(Grade.objects.all()).iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _write_term_totals(batch)
+                batch = []
+        if batch:
+            _write_term_totals(batch)
+    touch(TermGPA)
+    return TermGPA.objects.count()
+
+
+def get_transcript(student):
+    grades = (
+        Grade.objects.filter(enrollment__student=student)
+        .select_related('enrollment__course')
+        .order_by('academic_year', 'semester', 'enrollment__course__course_code')
+    )
+    terms = {
+        (term.academic_year, term.semester): term
+        for term in TermGPA.objects.filter(student=student)
+    }
+
+    transcript_terms = []
+    current = None
+    for grade in grades:
+        key = (grade.academic_year, grade.semester)
+        if current is None or current['key'] != key:
+            term = terms.get(key)
+            current = {
+                'key': key,
+                'semester': grade.semester,
+                'academic_year': grade.academic_year,
+                'credits': term.credits if term else 0,
+                'gpa': term.gpa if term else None,
+                'courses': [],
+            }
+            transcript_terms.append(current)
+        course = grade.enrollment.course
+        current['courses'].append({
+            'course_code': course.course_code,
+            'course_name': course.course_name,
+            'credits': course.credits,
+            'grade': grade.grade,
+            'points': Grade.GRADE_POINTS.get(grade.grade, 0),
+        })
+    for term in transcript_terms:
+        del term['key']
+
+    total_credits = sum(term.credits for term in terms.values())
+    total_points = sum(term.quality_points for term in terms.values())
+    return {
+        'student_id': student.student_id,
+        'name': f'{student.first_name} {student.last_name}',
+        'terms': transcript_terms,
+        'total_credits': total_credits,
+        'cumulative_gpa': round(total_points / total_credits, 2) if total_credits else None,
+    }
@@ -1,6 +1,6 @@
 # sms_app/urls.py
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.user_login, name='login'),
@@ -12,6 +12,8 @@ urlpatterns = [
     path('students/add/', views.add_student, name='add_student'),
     path('students/<str:student_id>/', views.student_detail, name='student_detail'),
     path('students/<str:student_id>/edit/', views.edit_student, name='edit_student'),
+    path('students/<str:student_id>/transcript/', views.student_transcript, name='student_transcript'),
+    path('students/<str:student_id>/transcript.json', views.student_transcript_json, name='student_transcript_json'),
     path('students/<str:student_id>/delete/', views.delete_student, name='delete_student'),
 
     # Course URLs
@@ -30,15 +32,36 @@ urlpatterns = [
     # Grade URLs
     path('grades/', views.grade_list, name='grade_list'),
     path('grades/add/', views.add_grade, name='add_grade'),
+    path('grades/gradebook/', views.gradebook, name='gradebook'),
     path('grades/<int:grade_id>/edit/', views.edit_grade, name='edit_grade'),
     path('grades/<int:grade_id>/delete/', views.delete_grade, name='delete_grade'),
     
     # Attendance URLs
     path('attendance/', views.attendance_list, name='attendance_list'),
     path('attendance/add/', views.add_attendance, name='add_attendance'),
+    path('attendance/roll-call/', views.roll_call, name='roll_call'),
     path('attendance/<int:attendance_id>/edit/', views.edit_attendance, name='edit_attendance'),
     path('attendance/<int:attendance_id>/delete/', views.delete_attendance, name='delete_attendance'),
 
+    # Reports
+    path('reports/analytics/', views.analytics_report, name='analytics_report'),
+
+    # Export URLs
+    path('export/<str:dataset>.csv', views.export_csv, name='export_csv'),
+
+    # Autocomplete URLs
+    path('autocomplete/students/', views.student_autocomplete, name='student_autocomplete'),
+    path('autocomplete/courses/', views.course_autocomplete, name='course_autocomplete'),
+    path('autocomplete/enrollments/', views.enrollment_autocomplete, name='enrollment_autocomplete'),
+
+    # JSON API
+    path('api/v1/<str:resource_name>/', api.collection, name='api_collection'),
+    path('api/v1/<str:resource_name>/<int:pk>/', api.detail, name='api_detail'),
+
+    # Debugging and monitoring
+    path('debug/sql/', views.sql_profile, name='sql_profile'),
+    path('metrics', views.metrics, name='metrics'),
+
     # Instructor URLs
     path('instructors/', views.instructor_list, name='instructor_list'),
     path('instructors/add/', views.add_instructor, name='add_instructor'),
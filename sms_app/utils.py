@@ -0,0 +1,22 @@
+from django.db import connections
+
+from .caching import touch
+
+
+def bulk_upsert(model, objs, unique_fields, update_fields, batch_size=1000):
+    # Insert rows, updating update_fields on rows that already exist
+    connection = connections[model.objects.db]
+    if not connection.features.supports_update_conflicts_with_target:
+        # MySQL's ON DUPLICATE KEY UPDATE resolves the conflicting key itself
+        # and refuses an explicit target
+        unique_fields = None
+    created = model.objects.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+    # Bulk writes send no model signals, so record the change here
+    touch(model)
+    return created
@@ -1,19 +1,46 @@
 # sms_app/views.py
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.conf import settings
 from django.contrib.auth.models import User, Group
-from django.db import models
-from .models import Student, Course, Enrollment, Grade, Attendance
-from .forms import StudentForm, CourseForm, EnrollmentForm, GradeForm, AttendanceForm, InstructorForm
+from django.core.paginator import Paginator
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
+from .models import (
+    Student, Course, Enrollment, Grade, Attendance, AtRiskFlag,
+    TermGPA, EnrollmentAttendance, CourseAttendanceDay,
+)
+from .forms import StudentForm, CourseForm, EnrollmentForm, GradeForm, AttendanceForm, InstructorForm, RollCallForm, GradebookForm
+from .roles import is_admin, is_teacher, is_admin_or_teacher
+from .caching import cached_page
+from .profiling import get_options as get_profiling_options, recent_profiles
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from .utils import bulk_upsert
+from .search import search_courses
+from .analytics import build_report
+from .rollups import refresh_course_days, refresh_enrollments
+from .transcripts import get_transcript, refresh_term_gpas
+from .filters import filter_grades, filter_attendance
+from .exporters import EXPORTS, Echo, write_csv
+from .stats import get_dashboard_stats, invalidate_grade_stats, invalidate_attendance_stats
 from django import forms
-
-def is_admin(user):
-    return user.is_superuser
-
-def is_teacher(user):
-    return user.groups.filter(name='Teachers').exists()
+from urllib.parse import urlencode
+import hmac
+
+STUDENTS_PER_PAGE = 50
+COURSES_PER_PAGE = 50
+GRADES_PER_PAGE = 50
+ATTENDANCE_PER_PAGE = 50
+INSTRUCTORS_PER_PAGE = 25
+ENROLLMENTS_PER_PAGE = 50
+AUTOCOMPLETE_LIMIT = 20
+AT_RISK_ON_DASHBOARD = 5
+AUTOCOMPLETE_MAX_LIMIT = 50
 
 def user_login(request):
     if request.method == 'POST':
@@ -38,31 +65,95 @@ def user_logout(request):
 
 @login_required
 def dashboard(request):
-    total_students = Student.objects.count()
-    total_courses = Course.objects.count()
-    can_add_grade = is_admin(request.user) or is_teacher(request.user)
-
-    context = {
-        'total_students': total_students,
-        'total_courses': total_courses,
-        'can_add_grade': can_add_grade,
-    }
+    context = get_dashboard_stats()
+    context['can_add_grade'] = is_admin_or_teacher(request.user)
+    # Precomputed by the flag_at_risk_students job
+    context['at_risk_count'] = AtRiskFlag.objects.count()
+    context['at_risk_flags'] = AtRiskFlag.objects.select_related(
+        'student', 'enrollment__course'
+    ).order_by(models.F('attendance_rate').asc(nulls_last=True), 'id')[:AT_RISK_ON_DASHBOARD]
     return render(request, 'sms_app/index.html', context)
 
+STUDENT_SORT_COLUMNS = {
+    'student_id': ('Student ID', ['student_id']),
+    'name': ('Name', ['last_name', 'first_name']),
+    'email': ('Email', ['email']),
+    'enrollment_date': ('Enrollment Date', ['enrollment_date']),
+}
+
 @login_required
+@cached_page(Student)
 def student_list(request):
-    students = Student.objects.all()
-    return render(request, 'sms_app/students.html', {'students': students})
+    students = Student.objects.only(
+        'student_id', 'first_name', 'last_name', 'email', 'phone', 'enrollment_date'
+    )
+
+    # Prefix matching keeps the search on the indexed columns; every word must
+    # match the start of an ID, name or email
+    search_query = request.GET.get('search', '').strip()
+    for term in search_query.split():
+        students = students.filter(
+            models.Q(student_id__istartswith=term) |
+            models.Q(first_name__istartswith=term) |
+            models.Q(last_name__istartswith=term) |
+            models.Q(email__istartswith=term)
+        )
+
+    # Handle sorting
+    sort = request.GET.get('sort', 'name')
+    descending = sort.startswith('-')
+    sort_key = sort.lstrip('-')
+    if sort_key not in STUDENT_SORT_COLUMNS:
+        sort_key, descending = 'name', False
+    order_fields = STUDENT_SORT_COLUMNS[sort_key][1] + ['id']
+    students = students.order_by(*[f'-{f}' if descending else f for f in order_fields])
+
+    columns = [
+        {
+            'label': label,
+            'sort': f'-{key}' if key == sort_key and not descending else key,
+            'active': key == sort_key,
+            'descending': descending,
+        }
+        for key, (label, fields) in STUDENT_SORT_COLUMNS.items()
+    ]
+
+    paginator = Paginator(students, STUDENTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    return render(request, 'sms_app/students.html', {
+        'students': page_obj.object_list,
+        'page_obj': page_obj,
+        'columns': columns
+    })
 
 @login_required
+@cached_page(Student, Enrollment, Course, User, TermGPA, EnrollmentAttendance)
 def student_detail(request, student_id):
     student = get_object_or_404(Student, student_id=student_id)
-    enrollments = Enrollment.objects.filter(student=student)
+    enrollments = Enrollment.objects.filter(student=student).select_related('course__instructor', 'attendance_rollup')
+    totals = student.term_gpas.aggregate(credits=models.Sum('credits'), points=models.Sum('quality_points'))
+    cumulative_gpa = round(totals['points'] / totals['credits'], 2) if totals['credits'] else None
     return render(request, 'sms_app/student_detail.html', {
         'student': student,
-        'enrollments': enrollments
+        'enrollments': enrollments,
+        'cumulative_gpa': cumulative_gpa,
+        'total_credits': totals['credits'] or 0
     })
 
+@login_required
+def student_transcript(request, student_id):
+    student = get_object_or_404(Student, student_id=student_id)
+    return render(request, 'sms_app/transcript.html', {
+        'student': student,
+        'transcript': get_transcript(student)
+    })
+
+@login_required
+def student_transcript_json(request, student_id):
+    student = get_object_or_404(Student, student_id=student_id)
+    return JsonResponse(get_transcript(student))
+
 @login_required
 @user_passes_test(is_admin)
 def add_student(request):
@@ -104,37 +195,45 @@ def delete_student(request, student_id):
     return render(request, 'sms_app/delete_student.html', {'student': student})
 
 @login_required
+@cached_page(Course, User, Group)
 def course_list(request):
-    courses = Course.objects.all()
+    courses = Course.objects.select_related('instructor').defer('description', 'search_document').order_by('course_code')
 
     # Handle search and filter
     search_query = request.GET.get('search', '')
     instructor_id = request.GET.get('instructor', '')
 
-    if search_query:
-        courses = courses.filter(
-            models.Q(course_code__icontains=search_query) |
-            models.Q(course_name__icontains=search_query)
-        )
-
     if instructor_id:
         courses = courses.filter(instructor_id=instructor_id)
 
+    if search_query:
+        courses = search_courses(courses, search_query)
+
+    paginator = Paginator(courses, COURSES_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
     # Get all instructors for the filter dropdown
     instructors = User.objects.filter(groups__name='Teachers').distinct()
 
     return render(request, 'sms_app/courses.html', {
-        'courses': courses,
+        'courses': page_obj.object_list,
+        'page_obj': page_obj,
         'instructors': instructors
     })
 
 @login_required
+@cached_page(Course, Enrollment, Student, CourseAttendanceDay, EnrollmentAttendance, User)
 def course_detail(request, course_code):
     course = get_object_or_404(Course, course_code=course_code)
-    enrollments = Enrollment.objects.filter(course=course)
+    enrollments = list(
+        Enrollment.objects.filter(course=course).select_related('student', 'attendance_rollup')
+    )
+    totals = course.attendance_days.aggregate(present=models.Sum('present'), absent=models.Sum('absent'))
+    recorded = (totals['present'] or 0) + (totals['absent'] or 0)
     return render(request, 'sms_app/course_detail.html', {
         'course': course,
-        'enrollments': enrollments
+        'enrollments': enrollments,
+        'attendance_rate': round(100 * totals['present'] / recorded, 1) if recorded else None
     })
 
 @login_required
@@ -178,11 +277,18 @@ def delete_course(request, course_code):
     return render(request, 'sms_app/delete_course.html', {'course': course})
 
 @login_required
+@cached_page(Enrollment, Student, Course)
 def enrollment_list(request):
-    enrollments = Enrollment.objects.all()
-    can_manage_enrollment = is_admin(request.user) or is_teacher(request.user)
+    # Each row shows its student and course, so join them into the page query
+    enrollments = Enrollment.objects.select_related('student', 'course').defer(
+        'student__address', 'course__description', 'course__search_document'
+    ).order_by('id')
+    paginator = Paginator(enrollments, ENROLLMENTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    can_manage_enrollment = is_admin_or_teacher(request.user)
     return render(request, 'sms_app/enrollments.html', {
-        'enrollments': enrollments,
+        'enrollments': page_obj.object_list,
+        'page_obj': page_obj,
         'can_manage_enrollment': can_manage_enrollment
     })
 
@@ -227,18 +333,42 @@ def add_enrollment(request):
     return render(request, 'sms_app/add_enrollment.html', {'form': form})
 
 @login_required
+@cached_page(Grade, Enrollment, Student, Course)
 def grade_list(request):
-    grades = Grade.objects.all()
-    can_add_grade = is_admin(request.user) or is_teacher(request.user)
+    # Join the enrollment chain up front so each row renders without extra queries.
+    # Newest term first. Ordering only on Grade columns, all in one direction,
+    # lets grade_list_order_idx be scanned backward (MariaDB ignores DESC in
+    # index definitions before 10.8).
+    grades = Grade.objects.select_related(
+        'enrollment__student', 'enrollment__course'
+    ).order_by('-academic_year', '-semester', '-id')
+
+    # Handle filters
+    grades = filter_grades(grades, request.GET)
+
+    paginator = Paginator(grades, GRADES_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    # Options for the filter dropdowns
+    semesters = Grade.objects.order_by('semester').values_list('semester', flat=True).distinct()
+    academic_years = Grade.objects.order_by('-academic_year').values_list('academic_year', flat=True).distinct()
+    courses = Course.objects.order_by('course_code').only('course_code', 'course_name')
+
+    can_add_grade = is_admin_or_teacher(request.user)
     can_edit_grade = can_add_grade
     return render(request, 'sms_app/grades.html', {
-        'grades': grades,
+        'grades': page_obj.object_list,
+        'page_obj': page_obj,
+        'semesters': semesters,
+        'academic_years': academic_years,
+        'courses': courses,
+        'grade_choices': Grade.GRADE_CHOICES,
         'can_add_grade': can_add_grade,
         'can_edit_grade': can_edit_grade
     })
 
 @login_required
-@user_passes_test(lambda u: is_admin(u) or is_teacher(u))
+@user_passes_test(is_admin_or_teacher)
 def add_grade(request):
     if request.method == 'POST':
         form = GradeForm(request.POST)
@@ -252,7 +382,75 @@ def add_grade(request):
     return render(request, 'sms_app/add_grade.html', {'form': form})
 
 @login_required
-@user_passes_test(lambda u: is_admin(u) or is_teacher(u))
+@user_passes_test(is_admin_or_teacher)
+def gradebook(request):
+    # Course and term come from the query string on GET and the form body on POST
+    form = GradebookForm(request.POST if request.method == 'POST' else (request.GET or None))
+    enrollments = []
+
+    if form.is_valid():
+        course = form.cleaned_data['course']
+        semester = form.cleaned_data['semester']
+        academic_year = form.cleaned_data['academic_year']
+        enrollments = list(
+            Enrollment.objects.filter(course=course)
+            .select_related('student')
+            .order_by('student__last_name', 'student__first_name', 'student__student_id')
+        )
+        existing = {
+            grade.enrollment_id: grade
+            for grade in Grade.objects.filter(enrollment__course=course, semester=semester, academic_year=academic_year)
+        }
+
+        if request.method == 'POST':
+            valid_grades = {value for value, label in Grade.GRADE_CHOICES}
+            to_save, to_delete = [], []
+            added = updated = 0
+            for enrollment in enrollments:
+                letter = request.POST.get(f'grade_{enrollment.id}', '')
+                grade = existing.get(enrollment.id)
+                if letter in valid_grades:
+                    if grade is None or grade.grade != letter:
+                        to_save.append(Grade(
+                            enrollment=enrollment, grade=letter,
+                            semester=semester, academic_year=academic_year
+                        ))
+                        added += grade is None
+                        updated += grade is not None
+                elif not letter and grade is not None:
+                    # Clearing a cell removes the grade
+                    to_delete.append(grade.id)
+
+            with transaction.atomic():
+                # New and changed cells go out as one upsert on (enrollment, semester, academic_year)
+                bulk_upsert(
+                    Grade, to_save,
+                    unique_fields=['enrollment', 'semester', 'academic_year'],
+                    update_fields=['grade'],
+                )
+                Grade.objects.filter(id__in=to_delete).delete()
+            invalidate_grade_stats()
+            refresh_term_gpas([e.student_id for e in enrollments], semester, academic_year)
+
+            messages.success(
+                request,
+                f'Gradebook saved: {added} added, {updated} updated, {len(to_delete)} removed'
+            )
+            query = urlencode({'course': course.course_code, 'semester': semester, 'academic_year': academic_year})
+            return redirect(f"{reverse('grade_list')}?{query}")
+
+        for enrollment in enrollments:
+            grade = existing.get(enrollment.id)
+            enrollment.current_grade = grade.grade if grade else ''
+
+    return render(request, 'sms_app/gradebook.html', {
+        'form': form,
+        'enrollments': enrollments,
+        'grade_choices': Grade.GRADE_CHOICES
+    })
+
+@login_required
+@user_passes_test(is_admin_or_teacher)
 def edit_grade(request, grade_id):
     grade = get_object_or_404(Grade, id=grade_id)
     if request.method == 'POST':
@@ -267,7 +465,7 @@ def edit_grade(request, grade_id):
     return render(request, 'sms_app/edit_grade.html', {'form': form, 'grade': grade})
 
 @login_required
-@user_passes_test(lambda u: is_admin(u) or is_teacher(u))
+@user_passes_test(is_admin_or_teacher)
 def delete_grade(request, grade_id):
     grade = get_object_or_404(Grade, id=grade_id)
     if request.method == 'POST':
@@ -277,19 +475,61 @@ def delete_grade(request, grade_id):
 
     return render(request, 'sms_app/delete_grade.html', {'grade': grade})
 
+def _parse_attendance_cursor(cursor):
+    # Cursors look like "2024-09-01.1234": the (date, id) of the last row seen
+    date_part, _, id_part = cursor.partition('.')
+    try:
+        cursor_date = parse_date(date_part) if date_part else None
+    except ValueError:
+        # Well-formed but impossible dates such as 2024-02-30
+        return None
+    if cursor_date is None or not id_part.isdigit():
+        return None
+    return cursor_date, int(id_part)
+
 @login_required
+@cached_page(Attendance, Enrollment, Student, Course)
 def attendance_list(request):
-    attendances = Attendance.objects.all()
-    can_add_attendance = is_admin(request.user) or is_teacher(request.user)
+    # Newest first, keyed on (date, id) so every page is an index range scan
+    attendances = Attendance.objects.select_related(
+        'enrollment__student', 'enrollment__course'
+    ).order_by('-date', '-id')
+
+    # Handle filters
+    attendances = filter_attendance(attendances, request.GET)
+
+    cursor = _parse_attendance_cursor(request.GET.get('cursor', ''))
+    if cursor:
+        cursor_date, cursor_id = cursor
+        attendances = attendances.filter(
+            models.Q(date__lt=cursor_date) |
+            models.Q(date=cursor_date, id__lt=cursor_id)
+        )
+
+    # Fetch one extra row to find out whether there is a next page
+    rows = list(attendances[:ATTENDANCE_PER_PAGE + 1])
+    next_cursor = None
+    if len(rows) > ATTENDANCE_PER_PAGE:
+        rows = rows[:ATTENDANCE_PER_PAGE]
+        last = rows[-1]
+        next_cursor = f"{last.date.isoformat()}.{last.id}"
+
+    courses = Course.objects.order_by('course_code').only('course_code', 'course_name')
+
+    can_add_attendance = is_admin_or_teacher(request.user)
     can_edit_attendance = can_add_attendance
     return render(request, 'sms_app/attendance.html', {
-        'attendances': attendances,
+        'attendances': rows,
+        'next_cursor': next_cursor,
+        'is_first_page': cursor is None,
+        'courses': courses,
+        'status_choices': Attendance._meta.get_field('status').choices,
         'can_add_attendance': can_add_attendance,
         'can_edit_attendance': can_edit_attendance
     })
 
 @login_required
-@user_passes_test(lambda u: is_admin(u) or is_teacher(u))
+@user_passes_test(is_admin_or_teacher)
 def add_attendance(request):
     if request.method == 'POST':
         form = AttendanceForm(request.POST)
@@ -303,7 +543,56 @@ def add_attendance(request):
     return render(request, 'sms_app/add_attendance.html', {'form': form})
 
 @login_required
-@user_passes_test(lambda u: is_admin(u) or is_teacher(u))
+@user_passes_test(is_admin_or_teacher)
+def roll_call(request):
+    # Course and date come from the query string on GET and the form body on POST
+    form = RollCallForm(request.POST if request.method == 'POST' else (request.GET or None))
+    enrollments = []
+    status_choices = Attendance._meta.get_field('status').choices
+
+    if form.is_valid():
+        course = form.cleaned_data['course']
+        date = form.cleaned_data['date']
+        enrollments = list(
+            Enrollment.objects.filter(course=course)
+            .select_related('student')
+            .order_by('student__last_name', 'student__first_name', 'student__student_id')
+        )
+
+        if request.method == 'POST':
+            valid_statuses = {value for value, label in status_choices}
+            records = []
+            for enrollment in enrollments:
+                status = request.POST.get(f'status_{enrollment.id}')
+                if status in valid_statuses:
+                    records.append(Attendance(enrollment=enrollment, date=date, status=status))
+
+            with transaction.atomic():
+                bulk_upsert(Attendance, records, unique_fields=['enrollment', 'date'], update_fields=['status'])
+            invalidate_attendance_stats(date)
+            refresh_enrollments([enrollment.id for enrollment in enrollments])
+            refresh_course_days(course.id, [date])
+
+            messages.success(request, f'Attendance recorded for {len(records)} student(s)')
+            query = urlencode({'course': course.course_code, 'date_from': date, 'date_to': date})
+            return redirect(f"{reverse('attendance_list')}?{query}")
+
+        # Pre-fill statuses already recorded for this day, defaulting to present
+        recorded = dict(
+            Attendance.objects.filter(enrollment__course=course, date=date)
+            .values_list('enrollment_id', 'status')
+        )
+        for enrollment in enrollments:
+            enrollment.current_status = recorded.get(enrollment.id, 'P')
+
+    return render(request, 'sms_app/roll_call.html', {
+        'form': form,
+        'enrollments': enrollments,
+        'status_choices': status_choices
+    })
+
+@login_required
+@user_passes_test(is_admin_or_teacher)
 def edit_attendance(request, attendance_id):
     attendance = get_object_or_404(Attendance, id=attendance_id)
     if request.method == 'POST':
@@ -318,7 +607,7 @@ def edit_attendance(request, attendance_id):
     return render(request, 'sms_app/edit_attendance.html', {'form': form, 'attendance': attendance})
 
 @login_required
-@user_passes_test(lambda u: is_admin(u) or is_teacher(u))
+@user_passes_test(is_admin_or_teacher)
 def delete_attendance(request, attendance_id):
     attendance = get_object_or_404(Attendance, id=attendance_id)
     if request.method == 'POST':
@@ -329,40 +618,59 @@ def delete_attendance(request, attendance_id):
     return render(request, 'sms_app/delete_attendance.html', {'attendance': attendance})
 
 @login_required
+@cached_page(User, Group, Course, Enrollment)
 def instructor_list(request):
-    # Get all users in the Teachers group
-    teachers_group = Group.objects.filter(name='Teachers').first()
-    if teachers_group:
-        instructors = teachers_group.user_set.all()
-    else:
-        instructors = User.objects.none()
-
-    # Also include superusers who might be instructors
-    all_instructors = User.objects.filter(is_staff=True) | instructors
-    all_instructors = all_instructors.distinct()
+    # Teachers and staff, with role and counts resolved in the same query
+    teacher_membership = User.groups.through.objects.filter(
+        user_id=models.OuterRef('pk'), group__name='Teachers'
+    )
+    course_count = Course.objects.filter(
+        instructor_id=models.OuterRef('pk')
+    ).order_by().values('instructor_id').annotate(
+        total=models.Count('id')
+    ).values('total')
+    student_count = Enrollment.objects.filter(
+        course__instructor_id=models.OuterRef('pk')
+    ).order_by().values('course__instructor_id').annotate(
+        total=models.Count('student_id', distinct=True)
+    ).values('total')
+
+    instructors = User.objects.annotate(
+        is_teacher=models.Exists(teacher_membership),
+        course_count=Coalesce(models.Subquery(course_count), 0),
+        student_count=Coalesce(models.Subquery(student_count), 0),
+    ).filter(
+        models.Q(is_staff=True) | models.Q(is_teacher=True)
+    ).order_by('username')
+
+    # Handle search
+    search_query = request.GET.get('search', '')
+    if search_query:
+        instructors = instructors.filter(
+            models.Q(username__icontains=search_query) |
+            models.Q(first_name__icontains=search_query) |
+            models.Q(last_name__icontains=search_query) |
+            models.Q(email__icontains=search_query)
+        )
 
-    # Add role information to each instructor
-    instructors_with_roles = []
-    for instructor in all_instructors:
-        is_teacher = instructor.groups.filter(name='Teachers').exists()
-        instructors_with_roles.append({
-            'user': instructor,
-            'is_teacher': is_teacher,
-            'course_count': instructor.course_set.count()
-        })
+    paginator = Paginator(instructors, INSTRUCTORS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
 
-    return render(request, 'sms_app/instructors.html', {'instructors': instructors_with_roles})
+    return render(request, 'sms_app/instructors.html', {
+        'instructors': page_obj.object_list,
+        'page_obj': page_obj
+    })
 
 @login_required
+@cached_page(User, Group, Course, Enrollment)
 def instructor_detail(request, instructor_id):
     instructor = get_object_or_404(User, id=instructor_id)
-    courses = Course.objects.filter(instructor=instructor)
-    is_teacher = instructor.groups.filter(name='Teachers').exists()
+    courses = Course.objects.filter(instructor=instructor).order_by('course_code')
 
     return render(request, 'sms_app/instructor_detail.html', {
         'instructor': instructor,
         'courses': courses,
-        'is_teacher': is_teacher
+        'is_teacher': is_teacher(instructor)
     })
 
 @login_required
@@ -403,7 +711,7 @@ def edit_instructor(request, instructor_id):
         form = InstructorForm(instance=instructor)
         form.fields['password'].required = False
         form.fields['password'].widget = forms.HiddenInput()
-        form.initial['is_teacher'] = instructor.groups.filter(name='Teachers').exists()
+        form.initial['is_teacher'] = is_teacher(instructor)
 
     return render(request, 'sms_app/edit_instructor.html', {'form': form, 'instructor': instructor})
 
@@ -416,4 +724,130 @@ def delete_instructor(request, instructor_id):
         messages.success(request, 'Instructor deleted successfully')
         return redirect('instructor_list')
 
-    return render(request, 'sms_app/delete_instructor.html', {'instructor': instructor})
\ No newline at end of file
+    return render(request, 'sms_app/delete_instructor.html', {'instructor': instructor})
+
+@login_required
+@user_passes_test(is_admin_or_teacher)
+def export_csv(request, dataset):
+    export = EXPORTS.get(dataset)
+    if export is None:
+        raise Http404('Unknown export')
+
+    # Rows are generated lazily, so the download starts immediately and memory
+    # use stays flat however many rows there are
+    rows = export.rows(request.GET)
+    response = StreamingHttpResponse(write_csv(Echo(), export.header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.csv"'
+    return response
+
+def _autocomplete_response(request, queryset, label):
+    try:
+        limit = min(max(int(request.GET.get('limit', AUTOCOMPLETE_LIMIT)), 1), AUTOCOMPLETE_MAX_LIMIT)
+        offset = max(int(request.GET.get('offset', 0)), 0)
+    except ValueError:
+        limit, offset = AUTOCOMPLETE_LIMIT, 0
+
+    # Fetch one extra row to find out whether there are more results
+    rows = list(queryset[offset:offset + limit + 1])
+    return JsonResponse({
+        'results': [{'id': row['id'], 'text': label(row)} for row in rows[:limit]],
+        'has_more': len(rows) > limit,
+    })
+
+@login_required
+def student_autocomplete(request):
+    students = Student.objects.order_by('last_name', 'first_name', 'id')
+    for term in request.GET.get('q', '').split():
+        students = students.filter(
+            models.Q(student_id__istartswith=term) |
+            models.Q(first_name__istartswith=term) |
+            models.Q(last_name__istartswith=term)
+        )
+    return _autocomplete_response(
+        request,
+        students.values('id', 'student_id', 'first_name', 'last_name'),
+        lambda row: f"{row['first_name']} {row['last_name']} ({row['student_id']})"
+    )
+
+@login_required
+def course_autocomplete(request):
+    courses = Course.objects.order_by('course_code')
+    for term in request.GET.get('q', '').split():
+        courses = courses.filter(
+            models.Q(course_code__istartswith=term) |
+            models.Q(course_name__istartswith=term)
+        )
+    return _autocomplete_response(
+        request,
+        courses.values('id', 'course_code', 'course_name'),
+        lambda row: f"{row['course_code']} - {row['course_name']}"
+    )
+
+@login_required
+def enrollment_autocomplete(request):
+    enrollments = Enrollment.objects.order_by('student__last_name', 'student__first_name', 'course__course_code', 'id')
+    for term in request.GET.get('q', '').split():
+        enrollments = enrollments.filter(
+            models.Q(student__student_id__istartswith=term) |
+            models.Q(student__first_name__istartswith=term) |
+            models.Q(student__last_name__istartswith=term) |
+            models.Q(course__course_code__istartswith=term)
+        )
+    return _autocomplete_response(
+        request,
+        enrollments.values(
+            'id', 'student__student_id', 'student__first_name', 'student__last_name',
+            'course__course_code', 'course__course_name'
+        ),
+        lambda row: (
+            f"{row['student__first_name']} {row['student__last_name']} ({row['student__student_id']}) "
+            f"enrolled in {row['course__course_code']} - {row['course__course_name']}"
+        )
+    )
+
+@login_required
+@user_passes_test(is_admin_or_teacher)
+def analytics_report(request):
+    semester = request.GET.get('semester', '')
+    academic_year = request.GET.get('academic_year', '')
+    course_code = request.GET.get('course', '')
+    report = build_report(semester=semester, academic_year=academic_year, course_code=course_code)
+
+    # Options for the filter dropdowns
+    semesters = Grade.objects.order_by('semester').values_list('semester', flat=True).distinct()
+    academic_years = Grade.objects.order_by('-academic_year').values_list('academic_year', flat=True).distinct()
+
+    return render(request, 'sms_app/analytics.html', {
+        'report': report,
+        'semesters': semesters,
+        'academic_years': academic_years
+    })
+
+@login_required
+@user_passes_test(is_admin)
+def sql_profile(request):
+    # Local debugging aid: only served while profiling is on in a DEBUG build
+    if not (settings.DEBUG and getattr(settings, 'SMS_SQL_PROFILING', False)):
+        raise Http404
+    threshold = get_profiling_options()['REPEAT_THRESHOLD']
+    profiles = [
+        {'profile': profile, 'groups': profile.groups()[:25], 'repeated': len(profile.repeated(threshold))}
+        for profile in reversed(recent_profiles)
+    ]
+    return render(request, 'sms_app/sql_profile.html', {
+        'profiles': profiles,
+        'threshold': threshold,
+    })
+
+def metrics(request):
+    # Scraped without a login: require the bearer token when one is configured,
+    # otherwise only answer the configured local addresses
+    if not getattr(settings, 'SMS_METRICS', False):
+        raise Http404
+    token = getattr(settings, 'SMS_METRICS_TOKEN', '')
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponseForbidden()
+    elif request.META.get('REMOTE_ADDR') not in getattr(settings, 'SMS_METRICS_ALLOWED_IPS', ()):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
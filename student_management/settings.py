@@ -26,6 +26,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'sms_app.metrics.MetricsMiddleware',
+    'sms_app.profiling.SQLProfilerMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -52,6 +54,16 @@ TEMPLATES = [
     },
 ]
 
+if not DEBUG:
+    # Parse each template once per process instead of on every render
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'student_management.wsgi.application'
 
 # Database
@@ -73,6 +85,58 @@ DATABASES = {
 import django.db.backends.mysql.base
 django.db.backends.mysql.base.DatabaseWrapper.check_database_version_supported = lambda self: None
 
+# Cache
+# Holds role flags, model change stamps, dashboard counters, per-user pages
+# and per-row template fragments. LocMemCache is private to each process, so
+# with several workers set SMS_REDIS_URL (e.g. redis://127.0.0.1:6379/1; needs
+# the redis package) so invalidation is seen by all of them.
+if os.environ.get('SMS_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['SMS_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'student-management',
+            'OPTIONS': {
+                # The default of 300 entries is exhausted by a single page of row
+                # fragments, which would cull change stamps and counters
+                'MAX_ENTRIES': 50000,
+                'CULL_FREQUENCY': 4,
+            },
+        }
+    }
+
+# SQL profiling for development: logs likely N+1 loops and slow queries, adds
+# an X-SQL-Profile header and serves /debug/sql/ (DEBUG only). When off the
+# middleware is dropped at startup.
+SMS_SQL_PROFILING = os.environ.get('SMS_SQL_PROFILING') == '1'
+SMS_SQL_PROFILING_OPTIONS = {
+    'SLOW_QUERY_MS': 100,
+    'REPEAT_THRESHOLD': 5,
+    'HISTORY': 50,
+}
+
+# Prometheus-style metrics at /metrics (per process), off unless SMS_METRICS=1.
+# With SMS_METRICS_TOKEN set, scrapers must send "Authorization: Bearer <token>".
+# Without a token, access falls back to REMOTE_ADDR; behind a reverse proxy on
+# the same host every client appears as 127.0.0.1, so set a token there.
+SMS_METRICS = os.environ.get('SMS_METRICS', '0') == '1'
+SMS_METRICS_TOKEN = os.environ.get('SMS_METRICS_TOKEN', '')
+SMS_METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# Read-only JSON API at /api/v1/. Browsers use the session; integrations send
+# "Authorization: Bearer <token>" with a token from SMS_API_TOKENS, given as
+# comma-separated username:token pairs. Each request then acts as that user.
+SMS_API_TOKENS = {
+    token: username
+    for username, token in (pair.strip().split(':', 1) for pair in os.environ.get('SMS_API_TOKENS', '').split(',') if ':' in pair)
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {